@@ -8,16 +8,25 @@ Inputs (all named CLI parameters):
   --vote_events  path to vote-events.dt JSON
   --persons      path to all-members.dt.analyses JSON or CSV
   --output       path to write the attendance.dt.analyses output JSON
+
+Optional:
+  --validate-sample N  validate every N-th votes row against the schema (default 1000)
+  --strict-validate    validate every votes row (same as --validate-sample 1)
+  --trust-inputs       skip schema validation of vote_events, persons and votes
+                       (for files already validated upstream in the pipeline)
+  --compact            write the output JSON without indentation
 """
 
 import argparse
 import csv
-import json
+import functools
 import sys
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from pathlib import Path
 
 import jsonschema
+import orjson
 
 
 # ── Schema paths ──────────────────────────────────────────────────────────────
@@ -33,10 +42,24 @@ SCHEMA_PATHS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def load_schema(key: str) -> dict:
     path = SCHEMA_PATHS[key]
-    with open(path) as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(key: str) -> jsonschema.protocols.Validator:
+    """Return a validator for SCHEMA_PATHS[key], built on first use and reused afterwards.
+
+    Unlike jsonschema.validate(), this checks the schema itself and selects the
+    validator class once, here, rather than on every call.
+    """
+    schema = load_schema(key)
+    validator_cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
 
 
 # ── Loaders ───────────────────────────────────────────────────────────────────
@@ -46,8 +69,8 @@ def load_json_or_csv(path: str) -> list | dict:
     p = Path(path)
     suffix = p.suffix.lower()
     if suffix == ".json":
-        with open(p) as f:
-            return json.load(f)
+        with open(p, "rb") as f:
+            return orjson.loads(f.read())
     elif suffix == ".csv":
         with open(p, newline="") as f:
             reader = csv.DictReader(f)
@@ -60,40 +83,81 @@ def load_definition(path: str) -> dict:
     p = Path(path)
     if p.suffix.lower() != ".json":
         raise ValueError(f"Definition file must be JSON, got: {path}")
-    with open(p) as f:
-        data = json.load(f)
-    schema = load_schema("definition")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"Definition file '{path}' failed schema validation: {e.message}")
+    with open(p, "rb") as f:
+        data = orjson.loads(f.read())
+    error = jsonschema.exceptions.best_match(get_validator("definition").iter_errors(data))
+    if error is not None:
+        sys.exit(f"Definition file '{path}' failed schema validation: {error.message}")
     return data
 
 
-def load_vote_events(path: str) -> list[dict]:
+def load_vote_events(path: str, validate: bool = True) -> list[dict]:
     data = load_json_or_csv(path)
     if not isinstance(data, list):
         sys.exit(f"vote_events file '{path}' must contain a JSON array")
-    schema = load_schema("vote_events")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"vote_events file '{path}' failed schema validation: {e.message}")
+    if not validate:
+        return data
+    error = jsonschema.exceptions.best_match(get_validator("vote_events").iter_errors(data))
+    if error is not None:
+        sys.exit(f"vote_events file '{path}' failed schema validation: {error.message}")
     return data
 
 
-def load_votes(path: str) -> list[dict]:
-    """Load votes from CSV (or JSON). Validates each row against votes-table schema."""
-    data = load_json_or_csv(path)
-    if not isinstance(data, list):
-        sys.exit(f"votes file '{path}' must be a list/array of rows")
-    row_schema = load_schema("votes_row")
-    validator = jsonschema.Draft7Validator(row_schema)
-    for i, row in enumerate(data):
-        row_errors = list(validator.iter_errors(dict(row)))
-        if row_errors:
-            sys.exit(f"votes file '{path}' row {i} failed schema validation: {row_errors[0].message}")
-    return data
+DEFAULT_VALIDATE_SAMPLE = 1000
+
+
+VOTE_COLUMNS = ("vote_event_id", "voter_id", "option")
+
+
+def iter_votes(path: str, sample_every: int = DEFAULT_VALIDATE_SAMPLE) -> Iterator[tuple[str, str, str]]:
+    """Yield (vote_event_id, voter_id, option) tuples from CSV (or JSON) one at a time.
+
+    CSV rows are streamed straight from the reader, so the votes table is never
+    held in memory as a whole, and only the three columns the calculation
+    needs are kept. The first row and every sample_every-th row after it are
+    validated against the votes-table schema; sample_every=1 validates every row
+    and sample_every=0 skips validation.
+    """
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix not in (".csv", ".json"):
+        raise ValueError(f"Unsupported file extension '{suffix}' for {path}. Expected .json or .csv")
+    validator = get_validator("votes_row") if sample_every else None
+    with open(p, newline="") as f:
+        if suffix == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            missing = [c for c in VOTE_COLUMNS if c not in header]
+            if missing:
+                sys.exit(f"votes file '{path}' is missing column(s): {', '.join(missing)}")
+            vid_i, voter_i, option_i = (header.index(c) for c in VOTE_COLUMNS)
+            width = len(header)
+            # Blank lines are skipped, as csv.DictReader does; rows are
+            # numbered without them. A dict is only built for the rows that
+            # are validated.
+            for i, row in enumerate(row for row in reader if row):
+                if len(row) < width:
+                    sys.exit(f"votes file '{path}' row {i} has {len(row)} field(s), expected {width}")
+                if sample_every and i % sample_every == 0:
+                    error = next(validator.iter_errors(dict(zip(header, row))), None)
+                    if error is not None:
+                        sys.exit(f"votes file '{path}' row {i} failed schema validation: {error.message}")
+                yield row[vid_i], row[voter_i], row[option_i]
+        else:
+            rows = orjson.loads(f.read())
+            if not isinstance(rows, list):
+                sys.exit(f"votes file '{path}' must be a list/array of rows")
+            for i, row in enumerate(rows):
+                if sample_every and i % sample_every == 0:
+                    error = next(validator.iter_errors(row), None)
+                    if error is not None:
+                        sys.exit(f"votes file '{path}' row {i} failed schema validation: {error.message}")
+                # Unsampled rows are not validated, but the columns read below must be strings
+                if not isinstance(row, dict) or not all(isinstance(row.get(c), str) for c in VOTE_COLUMNS):
+                    sys.exit(f"votes file '{path}' row {i} must have string {', '.join(VOTE_COLUMNS)} fields")
+                yield row["vote_event_id"], row["voter_id"], row["option"]
 
 
 def _parse_memberships_csv(raw: str) -> dict:
@@ -101,56 +165,73 @@ def _parse_memberships_csv(raw: str) -> dict:
     if not raw or raw.strip() in ("", "{}"):
         return {}
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return {}
 
 
-def load_persons(path: str) -> list[dict]:
-    """Load persons from JSON or CSV (all-members.dt.analyses format)."""
+_PERSON_JSON_FIELDS = frozenset(("identifiers", "sources", "other_names"))
+
+
+def _parse_person_csv_field(key: str, value: str | None):
+    """Convert one persons CSV cell to its final value in a single step.
+
+    JSON-encoded fields are parsed, memberships goes through
+    _parse_memberships_csv, and empty strings become None.
+    """
+    if key == "memberships":
+        value = _parse_memberships_csv(value)
+    elif key in _PERSON_JSON_FIELDS and value:
+        try:
+            value = orjson.loads(value)
+        except (orjson.JSONDecodeError, TypeError):
+            value = []
+    return None if value == "" else value
+
+
+def load_persons(path: str, validate: bool = True) -> list[dict]:
+    """Load persons from JSON or CSV (all-members.dt.analyses format).
+
+    validate=False skips the schema check for inputs already vetted upstream.
+    """
     p = Path(path)
     if p.suffix.lower() == ".csv":
         with open(p, newline="") as f:
-            reader = csv.DictReader(f)
-            rows = []
-            for row in reader:
-                person = dict(row)
-                # Parse JSON-encoded fields
-                for field in ("identifiers", "sources", "other_names"):
-                    if field in person and person[field]:
-                        try:
-                            person[field] = json.loads(person[field])
-                        except (json.JSONDecodeError, TypeError):
-                            person[field] = []
-                if "memberships" in person:
-                    person["memberships"] = _parse_memberships_csv(person["memberships"])
-                # Clean empty strings to None
-                for k, v in person.items():
-                    if v == "":
-                        person[k] = None
-                rows.append(person)
-        data = rows
+            data = [
+                {k: _parse_person_csv_field(k, v) for k, v in row.items()}
+                for row in csv.DictReader(f)
+            ]
     else:
-        with open(p) as f:
-            data = json.load(f)
+        with open(p, "rb") as f:
+            data = orjson.loads(f.read())
 
     if not isinstance(data, list):
         sys.exit(f"persons file '{path}' must contain an array of persons")
 
-    schema = load_schema("persons")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"persons file '{path}' failed schema validation: {e.message}")
+    if not validate:
+        return data
+    error = jsonschema.exceptions.best_match(get_validator("persons").iter_errors(data))
+    if error is not None:
+        sys.exit(f"persons file '{path}' failed schema validation: {error.message}")
     return data
 
 
 # ── Date helpers ──────────────────────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=None)
 def parse_date_prefix(s: str | None) -> date | None:
-    """Extract a date from an ISO date or datetime string, or return None."""
+    """Extract a date from an ISO date or datetime string, or return None.
+
+    Cached: many vote events share the same start_date string.
+    """
     if not s:
         return None
+    if len(s) == 10:
+        # Plain YYYY-MM-DD: parse as a date directly
+        try:
+            return date.fromisoformat(s)
+        except ValueError:
+            return None
     try:
         return datetime.fromisoformat(s).date()
     except ValueError:
@@ -174,51 +255,112 @@ def in_date_range(event_date: date | None, since: date | None, until: date | Non
 
 # ── Core calculation ──────────────────────────────────────────────────────────
 
-def calculate_attendance(definition: dict, vote_events: list[dict], votes: list[dict], persons: list[dict]) -> list[dict]:
-    """Compute attendance for each person and return the output array."""
+# Option codes: an option counts towards present, absent, or neither
+OTHER, PRESENT, ABSENT = 0, 1, 2
+
+# (classification, memberships key) pairs, in output order
+_ORG_KEYS = (
+    ("group",          "groups"),
+    ("candidate_list", "candidate_list"),
+    ("constituency",   "constituency"),
+)
+
+
+def option_sets(definition: dict) -> tuple[frozenset[str], frozenset[str]]:
+    """Return (present_options, absent_options) from an attendance definition."""
+    return frozenset(definition["present_options"]), frozenset(definition["absent_options"])
+
+
+def _build_org(g: dict, classification: str) -> dict:
+    """Build an output organization entry from a membership record."""
+    org: dict = {"id": g["id"], "classification": classification}
+    if g.get("name"):
+        org["name"] = g["name"]
+    # Map start_date/end_date → since/until (date portion only; skip if empty)
+    start = g.get("start_date")
+    end   = g.get("end_date")
+    if start:
+        org["since"] = start[:10]
+    if end:
+        org["until"] = end[:10]
+    return org
+
+
+def _aggregate_votes(
+    votes: Iterable[tuple[str, str, str]],
+    event_index: dict[str, int],
+    option_code: dict[str, int],
+) -> dict[str, list]:
+    """Aggregate vote rows into person_id -> [present, absent, event bitmap].
+
+    Only rows whose vote event is in event_index are counted. Distinct events
+    per person are tracked as a bitmap over the events (bit i = event_index i)
+    rather than a set of id strings.
+    """
+    bitmap_size = (len(event_index) + 7) // 8
+    # This loop runs once per vote row, so each row costs a single counts
+    # lookup and the counters are mutated in place.
+    counts: dict[str, list] = {}
+    for vid, person_id, option in votes:
+        # One probe both filters the row and gives its bit position
+        i = event_index.get(vid)
+        if i is None:
+            continue
+        c = counts.get(person_id)
+        if c is None:
+            c = counts[person_id] = [0, 0, bytearray(bitmap_size)]
+        c[2][i >> 3] |= 1 << (i & 7)
+        code = option_code.get(option, OTHER)
+        if code == PRESENT:
+            c[0] += 1
+        elif code == ABSENT:
+            c[1] += 1
+        # options not in either set are silently ignored in the count
+    return counts
+
+
+def calculate_attendance(definition: dict, vote_events: list[dict], votes: Iterable[tuple[str, str, str]], persons: list[dict]) -> list[dict]:
+    """Compute attendance for each person and return the output array.
+
+    votes holds (vote_event_id, voter_id, option) tuples and is consumed in a
+    single pass, so it may be a lazy iterator (see iter_votes).
+    """
 
     since_date = parse_date_prefix(definition.get("since"))
     until_date = parse_date_prefix(definition.get("until"))
-    present_options = set(definition["present_options"])
-    absent_options = set(definition["absent_options"])
+    # option string -> PRESENT/ABSENT code; present wins if an option is listed in both
+    present_options, absent_options = option_sets(definition)
+    option_code = {o: ABSENT for o in absent_options}
+    option_code.update({o: PRESENT for o in present_options})
 
     # Filter vote events: only valid ones within the date range
-    filtered_event_ids: set[str] = set()
-    for event in vote_events:
-        status = event.get("status", "valid")
-        if status in ("invalid", "test"):
-            continue
-        event_date = parse_date_prefix(event.get("start_date"))
-        if in_date_range(event_date, since_date, until_date):
-            filtered_event_ids.add(event["id"])
-
-    # Build per-person lookup from votes table
-    # person_id -> {present, absent, total (distinct vote_event_ids seen)}
-    counts: dict[str, dict] = {}
-    for row in votes:
-        vid = row["vote_event_id"]
-        if vid not in filtered_event_ids:
-            continue
-        person_id = row["voter_id"]
-        option = row["option"]
-        if person_id not in counts:
-            counts[person_id] = {"present": 0, "absent": 0, "events": set()}
-        counts[person_id]["events"].add(vid)
-        if option in present_options:
-            counts[person_id]["present"] += 1
-        elif option in absent_options:
-            counts[person_id]["absent"] += 1
-        # options not in either set are silently ignored in the count
+    filtered_event_ids: set[str]
+    if since_date is None and until_date is None:
+        # No date bounds: status alone decides, so dates need not be parsed
+        filtered_event_ids = {
+            event["id"] for event in vote_events
+            if event.get("status", "valid") not in ("invalid", "test")
+        }
+    else:
+        filtered_event_ids = set()
+        for event in vote_events:
+            status = event.get("status", "valid")
+            if status in ("invalid", "test"):
+                continue
+            event_date = parse_date_prefix(event.get("start_date"))
+            if in_date_range(event_date, since_date, until_date):
+                filtered_event_ids.add(event["id"])
+
+    event_index = {eid: i for i, eid in enumerate(filtered_event_ids)}
+    counts = _aggregate_votes(votes, event_index, option_code)
 
     # Build output rows
     output: list[dict] = []
     for person in persons:
         person_id = person["id"]
-        c = counts.get(person_id, {"present": 0, "absent": 0, "events": set()})
-        present = c["present"]
-        absent = c["absent"]
+        present, absent, events = counts.get(person_id) or (0, 0, b"")
         # vote_events_total = how many vote events this person appears in (any option)
-        vote_events_total = len(c["events"])
+        vote_events_total = int.from_bytes(events, "little").bit_count()
         present_share = (present / vote_events_total) if vote_events_total > 0 else None
 
         row: dict = {
@@ -246,26 +388,12 @@ def calculate_attendance(definition: dict, vote_events: list[dict], votes: list[
 
         # Organizations from all membership types (groups, candidate_list, constituency)
         memberships = person.get("memberships") or {}
-        orgs = []
-        for classification, key in [
-            ("group",          "groups"),
-            ("candidate_list", "candidate_list"),
-            ("constituency",   "constituency"),
-        ]:
-            for g in (memberships.get(key) or []):
-                if not g.get("id"):
-                    continue
-                org: dict = {"id": g["id"], "classification": classification}
-                if g.get("name"):
-                    org["name"] = g["name"]
-                # Map start_date/end_date → since/until (date portion only; skip if empty)
-                start = g.get("start_date")
-                end   = g.get("end_date")
-                if start:
-                    org["since"] = start[:10]
-                if end:
-                    org["until"] = end[:10]
-                orgs.append(org)
+        orgs = [
+            _build_org(g, classification)
+            for classification, key in _ORG_KEYS
+            for g in (memberships.get(key) or ())
+            if g.get("id")
+        ]
         if orgs:
             row["organizations"] = orgs
 
@@ -289,11 +417,9 @@ def calculate_attendance(definition: dict, vote_events: list[dict], votes: list[
 # ── Validation ────────────────────────────────────────────────────────────────
 
 def validate_output(data: list[dict]) -> None:
-    schema = load_schema("output")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"Output failed schema validation: {e.message}")
+    error = jsonschema.exceptions.best_match(get_validator("output").iter_errors(data))
+    if error is not None:
+        sys.exit(f"Output failed schema validation: {error.message}")
 
 
 # ── Entry point ───────────────────────────────────────────────────────────────
@@ -307,30 +433,53 @@ def main() -> None:
     parser.add_argument("--vote_events", required=True, help="Path to vote-events JSON")
     parser.add_argument("--persons",     required=True, help="Path to all-members JSON or CSV")
     parser.add_argument("--output",      required=True, help="Path to write output JSON")
+    parser.add_argument("--validate-sample", type=int, default=DEFAULT_VALIDATE_SAMPLE, metavar="N",
+                        help=f"Validate every N-th votes row (default {DEFAULT_VALIDATE_SAMPLE})")
+    parser.add_argument("--strict-validate", action="store_true",
+                        help="Validate every votes row (overrides --validate-sample)")
+    parser.add_argument("--trust-inputs", action="store_true",
+                        help="Skip schema validation of vote_events, persons and votes")
+    parser.add_argument("--compact", action="store_true",
+                        help="Write output JSON without indentation")
     args = parser.parse_args()
+    if args.validate_sample < 1:
+        parser.error("--validate-sample must be at least 1")
+    if args.strict_validate and args.trust_inputs:
+        parser.error("--strict-validate and --trust-inputs are mutually exclusive")
+    if args.trust_inputs:
+        sample_every = 0
+    elif args.strict_validate:
+        sample_every = 1
+    else:
+        sample_every = args.validate_sample
+    validate_inputs = not args.trust_inputs
+
+    # Build every validator up front so a missing or broken schema fails
+    # before any input is read.
+    print("Loading schemas...", file=sys.stderr)
+    schema_keys = SCHEMA_PATHS if validate_inputs else ("definition", "output")
+    for key in schema_keys:
+        get_validator(key)
 
     print("Loading and validating definition...", file=sys.stderr)
     definition = load_definition(args.definition)
 
-    print("Loading and validating vote_events...", file=sys.stderr)
-    vote_events = load_vote_events(args.vote_events)
-
-    print("Loading and validating votes...", file=sys.stderr)
-    votes = load_votes(args.votes)
+    print("Loading vote_events..." if args.trust_inputs else "Loading and validating vote_events...", file=sys.stderr)
+    vote_events = load_vote_events(args.vote_events, validate=validate_inputs)
 
-    print("Loading and validating persons...", file=sys.stderr)
-    persons = load_persons(args.persons)
+    print("Loading persons..." if args.trust_inputs else "Loading and validating persons...", file=sys.stderr)
+    persons = load_persons(args.persons, validate=validate_inputs)
 
-    print("Calculating attendance...", file=sys.stderr)
-    output = calculate_attendance(definition, vote_events, votes, persons)
+    print("Streaming votes and calculating attendance...", file=sys.stderr)
+    output = calculate_attendance(definition, vote_events, iter_votes(args.votes, sample_every), persons)
 
     print("Validating output...", file=sys.stderr)
     validate_output(output)
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(orjson.dumps(output, option=None if args.compact else orjson.OPT_INDENT_2))
 
     print(f"Done. Wrote {len(output)} attendance records to {args.output}", file=sys.stderr)
 
@@ -15,14 +15,20 @@ import json
 import sys
 
 
-def newest_name(organizations: list[dict], classification: str) -> str:
-    """Return the name of the most recently started org of the given classification."""
-    matches = [o for o in organizations if o.get("classification") == classification]
-    if not matches:
-        return ""
-    # Sort by since descending; entries without a date treated as oldest
-    matches.sort(key=lambda o: o.get("since") or "", reverse=True)
-    return matches[0].get("name") or ""
+def newest_names(organizations: list[dict]) -> dict[str, str]:
+    """Return {classification: name of the most recently started org} in one pass.
+
+    Entries without a date are treated as oldest; on equal dates the first
+    entry wins.
+    """
+    best: dict[str, tuple[str, str]] = {}
+    for o in organizations:
+        classification = o.get("classification")
+        since = o.get("since") or ""
+        current = best.get(classification)
+        if current is None or since > current[0]:
+            best[classification] = (since, o.get("name") or "")
+    return {classification: name for classification, (_, name) in best.items()}
 
 
 def main() -> None:
@@ -51,24 +57,24 @@ def main() -> None:
     ]
 
     with open(args.output, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
         for row in data:
-            orgs = row.get("organizations") or []
+            newest = newest_names(row.get("organizations") or [])
             ps = row.get("present_share")
-            writer.writerow({
-                "id":                   row["person_id"],
-                "name":                 row.get("name") or "",
-                "photo":                (row.get("extras") or {}).get("image") or "",
-                "candidate_list":       newest_name(orgs, "candidate_list"),
-                "group":                newest_name(orgs, "group"),
-                "constituency":         newest_name(orgs, "constituency"),
-                "present_share":        ps if ps is not None else "",
-                "present_share_percent": round(ps * 100) if ps is not None else "",
-                "vote_events_total":    row["vote_events_total"],
-                "present":              row["present"],
-                "absent":               row["absent"],
-            })
+            writer.writerow((
+                row["person_id"],                                # id
+                row.get("name") or "",                           # name
+                (row.get("extras") or {}).get("image") or "",    # photo
+                newest.get("candidate_list", ""),                # candidate_list
+                newest.get("group", ""),                         # group
+                newest.get("constituency", ""),                  # constituency
+                ps if ps is not None else "",                    # present_share
+                round(ps * 100) if ps is not None else "",       # present_share_percent
+                row["vote_events_total"],                        # vote_events_total
+                row["present"],                                  # present
+                row["absent"],                                   # absent
+            ))
 
     print(f"Wrote {len(data)} rows to {args.output}", file=sys.stderr)
 
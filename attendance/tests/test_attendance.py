@@ -18,6 +18,17 @@ from pathlib import Path
 import jsonschema
 import pytest
 
+# Import the analysis module directly
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from attendance import (
+    calculate_attendance,
+    iter_votes,
+    load_definition,
+    load_persons,
+    load_vote_events,
+    validate_output,
+)
+
 # ── Path constants ─────────────────────────────────────────────────────────────
 
 REPO_ROOT = Path(__file__).parent.parent.parent.parent  # legislature-data/
@@ -60,11 +71,15 @@ def run_script(*extra_args, output_path: Path | None = None) -> tuple[int, str,
 
 @pytest.fixture(scope="module")
 def output_data() -> list[dict]:
-    """Run the script once and return the output for all tests in this module."""
-    rc, stdout, stderr, data = run_script()
-    assert rc == 0, f"Script failed:\nSTDOUT: {stdout}\nSTDERR: {stderr}"
-    assert data is not None, "No output data produced"
-    return data
+    """Compute the output once, in-process, for all tests in this module."""
+    output = calculate_attendance(
+        load_definition(str(TEST_DEFINITION)),
+        load_vote_events(str(TEST_VOTE_EVENTS)),
+        iter_votes(str(TEST_VOTES)),
+        load_persons(str(TEST_PERSONS)),
+    )
+    validate_output(output)
+    return output
 
 
 @pytest.fixture(scope="module")
@@ -249,3 +264,46 @@ class TestExtras:
             if (row.get("extras") or {}).get("image")
         ]
         assert len(images) > 0, "No person has an image URL – check that persons input includes 'image' fields"
+
+
+class TestCli:
+    def test_script_matches_in_process_output(self, output_data):
+        """Running the script end to end must produce the same records."""
+        rc, stdout, stderr, data = run_script()
+        assert rc == 0, f"Script failed:\nSTDOUT: {stdout}\nSTDERR: {stderr}"
+        assert data == output_data
+
+
+class TestIterVotesCsv:
+    def test_blank_lines_skipped(self, tmp_path):
+        """Blank lines in votes.csv are ignored, as csv.DictReader ignores them."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\n\nve1,p2,no\n\n")
+        assert list(iter_votes(str(path), sample_every=1000)) == [("ve1", "p1", "yes"), ("ve1", "p2", "no")]
+
+    def test_short_row_exits_cleanly(self, tmp_path):
+        """A row with fewer fields than the header stops with a message, not a traceback."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\nve1,p2\n")
+        with pytest.raises(SystemExit, match="row 1 has 2 field"):
+            list(iter_votes(str(path), sample_every=1000))
+
+    def test_json_row_missing_field_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row without voter_id stops with a message, not a KeyError."""
+        path = tmp_path / "votes.json"
+        path.write_text(json.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": "ve1", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path), sample_every=1000))
+
+    def test_json_row_null_id_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row with a null id stops with a message instead of yielding None."""
+        path = tmp_path / "votes.json"
+        path.write_text(json.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": None, "voter_id": "p2", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path), sample_every=1000))
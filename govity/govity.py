@@ -12,6 +12,10 @@ Inputs (all named CLI parameters):
 Optional:
   --since        ISO date (YYYY-MM-DD) — overrides definition's since
   --until        ISO date (YYYY-MM-DD) — overrides definition's until
+  --validate-sample N  validate every N-th votes row (default 1000)
+  --strict-validate    validate every votes row
+  --minimal-inactive  persons with govity_possible = 0 get only person_id, name,
+                 the counts and since/until (no names split, organizations, extras)
 
 Output (one row per person):
   person_id, name, given_names, family_names, organizations,
@@ -31,12 +35,17 @@ Govity numerator   = subset where MP was present and did NOT actively vote again
 
 import argparse
 import csv
-import json
+import functools
+import itertools
 import sys
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from pathlib import Path
 
 import jsonschema
+import orjson
 
 
 # ── Schema paths ───────────────────────────────────────────────────────────────
@@ -51,10 +60,20 @@ SCHEMA_PATHS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def load_schema(key: str) -> dict:
     path = SCHEMA_PATHS[key]
-    with open(path) as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(key: str) -> jsonschema.protocols.Validator:
+    """Validator for SCHEMA_PATHS[key]; the schema itself is checked once, here."""
+    schema = load_schema(key)
+    validator_cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
 
 
 # ── Loaders ────────────────────────────────────────────────────────────────────
@@ -63,8 +82,8 @@ def load_json_or_csv(path: str) -> list | dict:
     p = Path(path)
     suffix = p.suffix.lower()
     if suffix == ".json":
-        with open(p) as f:
-            return json.load(f)
+        with open(p, "rb") as f:
+            return orjson.loads(f.read())
     elif suffix == ".csv":
         with open(p, newline="") as f:
             return list(csv.DictReader(f))
@@ -73,13 +92,11 @@ def load_json_or_csv(path: str) -> list | dict:
 
 
 def load_definition(path: str) -> dict:
-    with open(path) as f:
-        data = json.load(f)
-    schema = load_schema("definition")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"Definition '{path}' failed schema validation: {e.message}")
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    error = jsonschema.exceptions.best_match(get_validator("definition").iter_errors(data))
+    if error is not None:
+        sys.exit(f"Definition '{path}' failed schema validation: {error.message}")
     return data
 
 
@@ -87,33 +104,75 @@ def load_vote_events(path: str) -> list[dict]:
     data = load_json_or_csv(path)
     if not isinstance(data, list):
         sys.exit(f"vote_events '{path}' must be a JSON array")
-    schema = load_schema("vote_events")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"vote_events '{path}' failed schema validation: {e.message}")
+    error = jsonschema.exceptions.best_match(get_validator("vote_events").iter_errors(data))
+    if error is not None:
+        sys.exit(f"vote_events '{path}' failed schema validation: {error.message}")
     return data
 
 
-def load_votes(path: str) -> list[dict]:
-    data = load_json_or_csv(path)
-    if not isinstance(data, list):
-        sys.exit(f"votes '{path}' must be a list/array")
-    row_schema = load_schema("votes_row")
-    validator = jsonschema.Draft7Validator(row_schema)
-    for i, row in enumerate(data):
-        row_errors = list(validator.iter_errors(dict(row)))
-        if row_errors:
-            sys.exit(f"votes '{path}' row {i} failed schema validation: {row_errors[0].message}")
-    return data
+DEFAULT_VALIDATE_SAMPLE = 1000
+
+
+VOTE_COLUMNS = ("vote_event_id", "voter_id", "option")
+
+
+def iter_votes(path: str, sample_every: int = DEFAULT_VALIDATE_SAMPLE) -> Iterator[tuple[str, str, str]]:
+    """Yield (vote_event_id, voter_id, option) tuples one at a time; CSV is never held in memory as a whole.
+
+    The first row and every sample_every-th row after it are validated against
+    the votes-table schema; sample_every=1 validates every row. The ids and
+    options repeat across millions of rows, so they are interned: duplicates
+    share one string object and dict lookups hit the identity fast path.
+    """
+    intern = sys.intern
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix not in (".csv", ".json"):
+        raise ValueError(f"Unsupported extension '{suffix}' for {path}")
+    validator = get_validator("votes_row")
+    with open(p, newline="") as f:
+        if suffix == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            missing = [c for c in VOTE_COLUMNS if c not in header]
+            if missing:
+                sys.exit(f"votes '{path}' is missing column(s): {', '.join(missing)}")
+            vid_i, voter_i, option_i = (header.index(c) for c in VOTE_COLUMNS)
+            width = len(header)
+            # Blank lines are skipped, as csv.DictReader does; rows are
+            # numbered without them. A dict is only built for the rows that
+            # are validated
+            for i, row in enumerate(row for row in reader if row):
+                if len(row) < width:
+                    sys.exit(f"votes '{path}' row {i} has {len(row)} field(s), expected {width}")
+                if i % sample_every == 0:
+                    error = next(validator.iter_errors(dict(zip(header, row))), None)
+                    if error is not None:
+                        sys.exit(f"votes '{path}' row {i} failed schema validation: {error.message}")
+                yield intern(row[vid_i]), intern(row[voter_i]), intern(row[option_i])
+        else:
+            rows = orjson.loads(f.read())
+            if not isinstance(rows, list):
+                sys.exit(f"votes '{path}' must be a list/array")
+            for i, row in enumerate(rows):
+                if i % sample_every == 0:
+                    error = next(validator.iter_errors(row), None)
+                    if error is not None:
+                        sys.exit(f"votes '{path}' row {i} failed schema validation: {error.message}")
+                # Unsampled rows are not validated, but the columns read below must be strings
+                if not isinstance(row, dict) or not all(isinstance(row.get(c), str) for c in VOTE_COLUMNS):
+                    sys.exit(f"votes '{path}' row {i} must have string {', '.join(VOTE_COLUMNS)} fields")
+                yield intern(row["vote_event_id"]), intern(row["voter_id"]), intern(row["option"])
 
 
 def _parse_memberships_csv(raw: str) -> dict:
     if not raw or raw.strip() in ("", "{}"):
         return {}
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return {}
 
 
@@ -127,8 +186,8 @@ def load_persons(path: str) -> list[dict]:
                 for field in ("identifiers", "sources", "other_names"):
                     if field in person and person[field]:
                         try:
-                            person[field] = json.loads(person[field])
-                        except (json.JSONDecodeError, TypeError):
+                            person[field] = orjson.loads(person[field])
+                        except (orjson.JSONDecodeError, TypeError):
                             person[field] = []
                 if "memberships" in person:
                     person["memberships"] = _parse_memberships_csv(person["memberships"])
@@ -138,15 +197,13 @@ def load_persons(path: str) -> list[dict]:
                 rows.append(person)
         data = rows
     else:
-        with open(p) as f:
-            data = json.load(f)
+        with open(p, "rb") as f:
+            data = orjson.loads(f.read())
     if not isinstance(data, list):
         sys.exit(f"persons '{path}' must be an array")
-    schema = load_schema("persons")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"persons '{path}' failed schema validation: {e.message}")
+    error = jsonschema.exceptions.best_match(get_validator("persons").iter_errors(data))
+    if error is not None:
+        sys.exit(f"persons '{path}' failed schema validation: {error.message}")
     return data
 
 
@@ -164,7 +221,13 @@ def parse_date_prefix(s: str | None) -> date | None:
             return None
 
 
-def in_date_range(d: date | None, since: date | None, until: date | None) -> bool:
+def date_ordinal(s: str | None) -> int | None:
+    d = parse_date_prefix(s)
+    return d.toordinal() if d is not None else None
+
+
+def in_date_range(d: int | None, since: int | None, until: int | None) -> bool:
+    # Dates are compared as proleptic ordinals (date.toordinal())
     if d is None:
         return True
     if since is not None and d < since:
@@ -176,8 +239,16 @@ def in_date_range(d: date | None, since: date | None, until: date | None) -> boo
 
 # ── Group membership lookup ────────────────────────────────────────────────────
 
-def build_group_memberships(persons: list[dict]) -> dict[str, list[tuple]]:
-    result: dict[str, list[tuple]] = {}
+# Per person: (starts, ends, group_ids) as parallel lists sorted by start ascending.
+# Dates are ordinals; open-ended memberships use the sentinels below.
+GroupMemberships = dict[str, tuple[list[int], list[int], list[str]]]
+
+_OPEN_START = date.min.toordinal()
+_OPEN_END = date.max.toordinal()
+
+
+def build_group_memberships(persons: list[dict]) -> GroupMemberships:
+    result: GroupMemberships = {}
     for p in persons:
         pid = p.get("id") or p.get("person_id", "")
         groups = (p.get("memberships") or {}).get("groups") or []
@@ -186,21 +257,29 @@ def build_group_memberships(persons: list[dict]) -> dict[str, list[tuple]]:
             gid = g.get("id")
             if not gid:
                 continue
-            entries.append((gid, parse_date_prefix(g.get("start_date")), parse_date_prefix(g.get("end_date"))))
-        entries.sort(key=lambda t: t[1] or date.min, reverse=True)
-        result[pid] = entries
+            gid = sys.intern(gid)
+            start, end = date_ordinal(g.get("start_date")), date_ordinal(g.get("end_date"))
+            entries.append((gid, _OPEN_START if start is None else start, _OPEN_END if end is None else end))
+        # Reversed first so that, walking back from the end, entries with equal
+        # starts come out in their original order
+        entries = sorted(reversed(entries), key=lambda t: t[1])
+        result[pid] = ([t[1] for t in entries], [t[2] for t in entries], [t[0] for t in entries])
     return result
 
 
-def get_group_at_date(person_id: str, event_date: date | None,
-                      group_memberships: dict[str, list[tuple]]) -> str | None:
-    for (gid, start, end) in group_memberships.get(person_id, []):
-        if event_date is not None:
-            if start is not None and event_date < start:
-                continue
-            if end is not None and event_date > end:
-                continue
-        return gid
+def get_group_at_date(person_id: str, event_date: int | None,
+                      group_memberships: GroupMemberships) -> str | None:
+    """Group of the latest-starting membership covering event_date (any membership if no date)."""
+    entry = group_memberships.get(person_id)
+    if not entry or not entry[2]:
+        return None
+    starts, ends, gids = entry
+    if event_date is None:
+        return gids[-1]
+    # Memberships starting on or before the date, newest first; usually the first one covers it
+    for j in range(bisect_right(starts, event_date) - 1, -1, -1):
+        if event_date <= ends[j]:
+            return gids[j]
     return None
 
 
@@ -226,14 +305,57 @@ def vote_value_active(option: str, yes_opts: set[str], no_opts: set[str]) -> int
 
 # ── Core calculation ───────────────────────────────────────────────────────────
 
+_ORG_KEYS = (("group", "groups"), ("candidate_list", "candidate_list"), ("constituency", "constituency"))
+
+
+def _build_organizations(memberships: dict) -> list[dict]:
+    orgs = []
+    for classification, key in _ORG_KEYS:
+        for g in (memberships.get(key) or []):
+            if not g.get("id"):
+                continue
+            org: dict = {"id": g["id"], "classification": classification}
+            if g.get("name"):
+                org["name"] = g["name"]
+            if g.get("start_date"):
+                org["since"] = g["start_date"][:10]
+            if g.get("end_date"):
+                org["until"] = g["end_date"][:10]
+            orgs.append(org)
+    return orgs
+
+
+def _tally_govity(
+    p_votes: dict[int, int],
+    gov_direction: list[int],
+    code_active: tuple[int, ...],
+    code_present: tuple[bool, ...],
+) -> tuple[int, int]:
+    """(govity_total, govity_possible) for one person's {event index: option code} votes."""
+    total = possible = 0
+    # Only events the person actually voted in can count, so walk their
+    # votes rather than every valid event
+    for ev, code in p_votes.items():
+        gvdir = gov_direction[ev]
+        if gvdir == 0 or not code_present[code]:
+            continue
+        possible += 1
+        if code_active[code] * gvdir != -1:
+            total += 1
+    return total, possible
+
+
 def calculate_govity(
     definition: dict,
     vote_events: list[dict],
-    votes: list[dict],
+    votes: Iterable[tuple[str, str, str]],
     persons: list[dict],
     since_override: date | None,
     until_override: date | None,
-) -> list[dict]:
+    minimal_inactive: bool = False,
+) -> Iterator[dict]:
+    # votes is read once, so it may be a lazy iterator (see iter_votes).
+    # Rows are yielded one by one so the writer can stream them to disk.
 
     since_date = since_override or parse_date_prefix(definition.get("since"))
     until_date = until_override or parse_date_prefix(definition.get("until"))
@@ -243,61 +365,71 @@ def calculate_govity(
     gov_groups  = set(definition.get("government_groups") or [])
     gov_members = set(definition.get("government_members") or [])
 
+    since_ord = since_date.toordinal() if since_date is not None else None
+    until_ord = until_date.toordinal() if until_date is not None else None
     group_memberships = build_group_memberships(persons)
 
-    def is_in_government(person_id: str, event_date: date | None) -> bool:
-        if person_id in gov_members:
-            return True
-        gid = get_group_at_date(person_id, event_date, group_memberships)
-        return gid in gov_groups if gid else False
-
-    # Filter valid vote events
-    valid_events: dict[str, date | None] = {}
+    # Filter valid vote events and number them densely, so per-event state
+    # lives in plain lists indexed by position instead of dicts keyed by id
+    event_index: dict[str, int] = {}
+    event_dates: list[int | None] = []
     for ev in vote_events:
         if ev.get("status", "valid") in ("invalid", "test"):
             continue
-        ev_date = parse_date_prefix(ev.get("start_date"))
-        if in_date_range(ev_date, since_date, until_date):
-            valid_events[ev["id"]] = ev_date
-
-    # Index votes
-    votes_by_event: dict[str, list[tuple[str, str]]] = {}
-    person_vote: dict[str, dict[str, str]] = {}
-    for row in votes:
-        eid = row["vote_event_id"]
-        if eid not in valid_events:
+        ev_date = date_ordinal(ev.get("start_date"))
+        if in_date_range(ev_date, since_ord, until_ord):
+            if ev["id"] not in event_index:
+                event_index[ev["id"]] = len(event_dates)
+                event_dates.append(ev_date)
+            else:
+                event_dates[event_index[ev["id"]]] = ev_date
+
+    # Encode options as small int codes indexing (value, active, present) tables.
+    # Code 0 is any option the definition does not list: value 0, not present.
+    option_info = [(0, 0, False)]
+    option_code: dict[str, int] = {}
+    for opt in sorted(yes_opts | no_opts | present_opts):
+        info = (vote_value(opt, yes_opts, no_opts, present_opts), vote_value_active(opt, yes_opts, no_opts), opt in present_opts)
+        if info not in option_info:
+            option_info.append(info)
+        option_code[opt] = option_info.index(info)
+    code_value, code_active, code_present = (tuple(col) for col in zip(*option_info))
+
+    # Per event date, whether each voter is in government, resolved the first
+    # time the voter is seen on that date. Events sharing a date share the dict.
+    gov_on_date: dict[int | None, dict[str, bool]] = {}
+    event_gov = [gov_on_date.setdefault(ev_date, {}) for ev_date in event_dates]
+
+    # Single pass over the votes: index them per person (options stored as
+    # codes) and accumulate the government vote sum per event
+    # (defaultdict avoids allocating a throwaway container per row as setdefault does)
+    person_vote: defaultdict[str, dict[int, int]] = defaultdict(dict)
+    gov_sums = [0] * len(event_dates)
+    for eid, pid, option in votes:
+        ev = event_index.get(eid)
+        if ev is None:
             continue
-        pid, opt = row["voter_id"], row["option"]
-        votes_by_event.setdefault(eid, []).append((pid, opt))
-        person_vote.setdefault(pid, {})[eid] = opt
-
-    # Compute government direction per event
-    gov_direction: dict[str, int] = {}
-    for eid, ev_date in valid_events.items():
-        gov_sum = 0
-        for (pid, opt) in votes_by_event.get(eid, []):
-            if is_in_government(pid, ev_date):
-                gov_sum += vote_value(opt, yes_opts, no_opts, present_opts)
-        gov_direction[eid] = 1 if gov_sum > 0 else (-1 if gov_sum < 0 else 0)
+        code = option_code.get(option, 0)
+        person_vote[pid][ev] = code
+        gov = event_gov[ev]
+        in_gov = gov.get(pid)
+        if in_gov is None:
+            in_gov = gov[pid] = (
+                pid in gov_members
+                or get_group_at_date(pid, event_dates[ev], group_memberships) in gov_groups
+            )
+        if in_gov:
+            gov_sums[ev] += code_value[code]
+
+    # Government direction per event
+    gov_direction = [(s > 0) - (s < 0) for s in gov_sums]
 
     # Build output
-    output: list[dict] = []
     for person in persons:
         pid = person.get("id") or person.get("person_id", "")
-        govity_total    = 0
-        govity_possible = 0
-        p_votes = person_vote.get(pid, {})
-
-        for eid, ev_date in valid_events.items():
-            gvdir = gov_direction.get(eid, 0)
-            if gvdir == 0:
-                continue
-            opt = p_votes.get(eid)
-            if opt is not None and opt in present_opts:
-                govity_possible += 1
-                active = vote_value_active(opt, yes_opts, no_opts)
-                if active * gvdir != -1:
-                    govity_total += 1
+        govity_total, govity_possible = _tally_govity(
+            person_vote.get(pid, {}), gov_direction, code_active, code_present
+        )
 
         row: dict = {
             "person_id":      pid,
@@ -308,6 +440,13 @@ def calculate_govity(
 
         if person.get("name"):
             row["name"] = person["name"]
+        if minimal_inactive and govity_possible == 0:
+            if since_date is not None:
+                row["since"] = since_date.isoformat()
+            if until_date is not None:
+                row["until"] = until_date.isoformat()
+            yield row
+            continue
         if person.get("given_names") or person.get("given_name"):
             given = person.get("given_names") or [person["given_name"]]
             if isinstance(given, str):
@@ -321,20 +460,7 @@ def calculate_govity(
             if family:
                 row["family_names"] = family
 
-        memberships = person.get("memberships") or {}
-        orgs = []
-        for classification, key in [("group", "groups"), ("candidate_list", "candidate_list"), ("constituency", "constituency")]:
-            for g in (memberships.get(key) or []):
-                if not g.get("id"):
-                    continue
-                org: dict = {"id": g["id"], "classification": classification}
-                if g.get("name"):
-                    org["name"] = g["name"]
-                if g.get("start_date"):
-                    org["since"] = g["start_date"][:10]
-                if g.get("end_date"):
-                    org["until"] = g["end_date"][:10]
-                orgs.append(org)
+        orgs = _build_organizations(person.get("memberships") or {})
         if orgs:
             row["organizations"] = orgs
 
@@ -349,13 +475,58 @@ def calculate_govity(
         if extras:
             row["extras"] = extras
 
-        output.append(row)
+        yield row
+
+
+# ── Output ─────────────────────────────────────────────────────────────────────
 
-    return output
+def write_output(rows: Iterable[dict], path: Path) -> int:
+    """Write rows as an indented JSON array one row at a time; return the row count.
+
+    Produces the same bytes as orjson.dumps(list(rows), option=OPT_INDENT_2).
+    The file is only opened once the first row is ready, so a run that fails
+    while computing leaves any previous output in place.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    with open(path, "wb") as f:
+        if first is None:
+            f.write(b"[]")
+            return 0
+        n = 0
+        for row in itertools.chain((first,), rows):
+            f.write(b"[\n  " if n == 0 else b",\n  ")
+            f.write(orjson.dumps(row, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+            n += 1
+        f.write(b"\n]")
+    return n
 
 
 # ── Entry point ────────────────────────────────────────────────────────────────
 
+def run(
+    definition_path: str,
+    votes_path: str,
+    vote_events_path: str,
+    persons_path: str,
+    since: str | None = None,
+    until: str | None = None,
+    minimal_inactive: bool = False,
+    validate_sample: int = DEFAULT_VALIDATE_SAMPLE,
+) -> Iterator[dict]:
+    since_override = parse_date_prefix(since)
+    until_override = parse_date_prefix(until)
+
+    print("Loading definition...",  file=sys.stderr)
+    definition = load_definition(definition_path)
+    print("Loading vote_events...", file=sys.stderr)
+    vote_events = load_vote_events(vote_events_path)
+    print("Loading persons...",     file=sys.stderr)
+    persons = load_persons(persons_path)
+    print("Streaming votes and calculating...", file=sys.stderr)
+    return calculate_govity(definition, vote_events, iter_votes(votes_path, validate_sample), persons, since_override, until_override, minimal_inactive)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--definition",  required=True)
@@ -365,27 +536,23 @@ def main() -> None:
     parser.add_argument("--output",      required=True)
     parser.add_argument("--since",       default=None)
     parser.add_argument("--until",       default=None)
+    parser.add_argument("--minimal-inactive", action="store_true",
+                        help="Emit only ids, names and counts for persons with govity_possible = 0")
+    parser.add_argument("--validate-sample", type=int, default=DEFAULT_VALIDATE_SAMPLE, metavar="N",
+                        help=f"Validate every N-th votes row (default {DEFAULT_VALIDATE_SAMPLE})")
+    parser.add_argument("--strict-validate", action="store_true",
+                        help="Validate every votes row (overrides --validate-sample)")
     args = parser.parse_args()
+    if args.validate_sample < 1:
+        parser.error("--validate-sample must be at least 1")
 
-    since_override = parse_date_prefix(args.since)
-    until_override = parse_date_prefix(args.until)
-
-    print("Loading definition...",  file=sys.stderr)
-    definition = load_definition(args.definition)
-    print("Loading vote_events...", file=sys.stderr)
-    vote_events = load_vote_events(args.vote_events)
-    print("Loading votes...",       file=sys.stderr)
-    votes = load_votes(args.votes)
-    print("Loading persons...",     file=sys.stderr)
-    persons = load_persons(args.persons)
-    print("Calculating...",         file=sys.stderr)
-    output = calculate_govity(definition, vote_events, votes, persons, since_override, until_override)
+    output = run(args.definition, args.votes, args.vote_events, args.persons, args.since, args.until,
+                 args.minimal_inactive, 1 if args.strict_validate else args.validate_sample)
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    print(f"Done. Wrote {len(output)} records to {args.output}", file=sys.stderr)
+    n = write_output(output, out_path)
+    print(f"Done. Wrote {n} records to {args.output}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -11,17 +11,25 @@ Usage:
 
 import argparse
 import csv
-import json
 import sys
 
+import orjson
 
-def newest_name(organizations: list[dict], classification: str) -> str:
-    """Return the name of the most recently started org of the given classification."""
-    matches = [o for o in organizations if o.get("classification") == classification]
-    if not matches:
-        return ""
-    matches.sort(key=lambda o: o.get("since") or "", reverse=True)
-    return matches[0].get("name") or ""
+
+def newest_names(organizations: list[dict]) -> dict[str, str]:
+    """Return {classification: name of the most recently started org} in one pass.
+
+    Entries without a date are treated as oldest; on equal dates the first
+    entry wins.
+    """
+    best: dict[str, tuple[str, str]] = {}
+    for o in organizations:
+        classification = o.get("classification")
+        since = o.get("since") or ""
+        current = best.get(classification)
+        if current is None or since > current[0]:
+            best[classification] = (since, o.get("name") or "")
+    return {classification: name for classification, (_, name) in best.items()}
 
 
 def main() -> None:
@@ -32,8 +40,8 @@ def main() -> None:
     parser.add_argument("--output", required=True, help="Path to write output CSV")
     args = parser.parse_args()
 
-    with open(args.input) as f:
-        data = json.load(f)
+    with open(args.input, "rb") as f:
+        data = orjson.loads(f.read())
 
     fieldnames = [
         "id",
@@ -48,24 +56,25 @@ def main() -> None:
         "govity_possible",
     ]
 
-    with open(args.output, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    # 1 MiB buffer: rows are small, so flush to disk in large chunks
+    with open(args.output, "w", newline="", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
         for row in data:
-            orgs = row.get("organizations") or []
+            newest = newest_names(row.get("organizations") or [])
             gv = row.get("govity")
-            writer.writerow({
-                "id":             row["person_id"],
-                "name":           row.get("name") or "",
-                "photo":          (row.get("extras") or {}).get("image") or "",
-                "candidate_list": newest_name(orgs, "candidate_list"),
-                "group":          newest_name(orgs, "group"),
-                "constituency":   newest_name(orgs, "constituency"),
-                "govity":         gv if gv is not None else "",
-                "govity_percent": round(gv * 100, 1) if gv is not None else "",
-                "govity_total":    row["govity_total"],
-                "govity_possible": row["govity_possible"],
-            })
+            writer.writerow((
+                row["person_id"],                                # id
+                row.get("name") or "",                           # name
+                (row.get("extras") or {}).get("image") or "",    # photo
+                newest.get("candidate_list", ""),                # candidate_list
+                newest.get("group", ""),                         # group
+                newest.get("constituency", ""),                  # constituency
+                gv if gv is not None else "",                    # govity
+                round(gv * 100, 1) if gv is not None else "",    # govity_percent
+                row["govity_total"],                             # govity_total
+                row["govity_possible"],                          # govity_possible
+            ))
 
     print(f"Wrote {len(data)} rows to {args.output}", file=sys.stderr)
 
@@ -7,15 +7,20 @@ or from the govity directory:
     python -m pytest tests/
 """
 
-import json
 import subprocess
 import sys
 import tempfile
+from collections import Counter
 from pathlib import Path
 
 import jsonschema
+import orjson
 import pytest
 
+# Import the analysis module directly
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from govity import iter_votes, run
+
 # ── Path constants ─────────────────────────────────────────────────────────────
 
 REPO_ROOT = Path(__file__).parent.parent.parent.parent  # legislature-data/
@@ -28,6 +33,9 @@ TEST_VOTES       = _LEGISLATURE / "work" / "standard" / "votes.csv"
 TEST_VOTE_EVENTS = _LEGISLATURE / "work" / "standard" / "vote_events.json"
 TEST_PERSONS     = _LEGISLATURE / "analyses" / "all-members" / "outputs" / "all_members.json"
 
+# Input paths as strings, in run() argument order, resolved once at import
+_INPUT_PATHS = (str(TEST_DEFINITION), str(TEST_VOTES), str(TEST_VOTE_EVENTS), str(TEST_PERSONS))
+
 # Output schema path
 _SCHEMA_BASE = REPO_ROOT / "legislature-data-standard" / "dist"
 OUTPUT_SCHEMA_PATH = _SCHEMA_BASE / "dt.analyses" / "govity" / "latest" / "schemas" / "govity.dt.analyses.json"
@@ -35,41 +43,150 @@ OUTPUT_SCHEMA_PATH = _SCHEMA_BASE / "dt.analyses" / "govity" / "latest" / "schem
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def run_script(*extra_args, output_path: Path | None = None) -> tuple[int, str, str, list[dict] | None]:
-    """Run the govity script and return (returncode, stdout, stderr, parsed_output)."""
+def run_script(*extra_args, output_path: Path | None = None) -> tuple[int, bytes, bytes, list[dict] | None]:
+    """Run the govity script and return (returncode, stdout, stderr, parsed_output).
+
+    stdout/stderr are raw bytes; decode them only when reporting a failure.
+    """
     with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
         out = Path(tmp.name) if output_path is None else output_path
 
+    definition, votes, vote_events, persons = _INPUT_PATHS
     cmd = [
         sys.executable, str(GOVITY_SCRIPT),
-        "--definition",  str(TEST_DEFINITION),
-        "--votes",       str(TEST_VOTES),
-        "--vote_events", str(TEST_VOTE_EVENTS),
-        "--persons",     str(TEST_PERSONS),
+        "--definition",  definition,
+        "--votes",       votes,
+        "--vote_events", vote_events,
+        "--persons",     persons,
         "--output",      str(out),
         *extra_args,
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, capture_output=True)
     data = None
     if result.returncode == 0 and out.exists():
-        with open(out) as f:
-            data = json.load(f)
+        data = orjson.loads(out.read_bytes())
     return result.returncode, result.stdout, result.stderr, data
 
 
-@pytest.fixture(scope="module")
+def run_in_process(since: str | None = None) -> list[dict]:
+    """Compute the govity output in-process on the test data."""
+    return list(run(*_INPUT_PATHS, since=since))
+
+
+@pytest.fixture(scope="session")
 def output_data() -> list[dict]:
-    """Run the script once and return the output for all tests in this module."""
-    rc, stdout, stderr, data = run_script()
-    assert rc == 0, f"Script failed:\nSTDOUT: {stdout}\nSTDERR: {stderr}"
-    assert data is not None, "No output data produced"
-    return data
+    """Compute the output once for the whole test session."""
+    return run_in_process()
+
+
+@pytest.fixture(scope="session")
+def output_by_id(output_data) -> dict[str, dict]:
+    """output_data keyed by person_id."""
+    return {r["person_id"]: r for r in output_data}
+
+
+@pytest.fixture(scope="session")
+def data_since() -> list[dict]:
+    """Output with the since override set to 2026-01-01."""
+    return run_in_process(since="2026-01-01")
+
+
+@pytest.fixture(scope="session")
+def govity_validator():
+    """Validator for the govity.dt.analyses output schema, built once."""
+    schema = orjson.loads(OUTPUT_SCHEMA_PATH.read_bytes())
+    cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    # The schema itself is checked once, here; a validator instance's
+    # validate() only checks instances against it
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+# Top-level keywords that leave nothing to check beyond the per-row "items" schema
+_ARRAY_ONLY_KEYWORDS = frozenset(("$schema", "$id", "title", "description", "type", "items", "definitions", "$defs"))
+
+
+@pytest.fixture(scope="session")
+def govity_item_validator(govity_validator):
+    """Validator for a single output row, or None if the schema is not a plain array of rows.
+
+    Built from the output validator so $refs still resolve against the full schema.
+    """
+    schema = govity_validator.schema
+    if schema.get("type") != "array" or not isinstance(schema.get("items"), dict):
+        return None
+    if set(schema) - _ARRAY_ONLY_KEYWORDS:
+        return None
+    return govity_validator.evolve(schema=schema["items"])
+
+
+@pytest.fixture(scope="session")
+def row_diagnostics(output_data) -> dict[str, list[str]]:
+    """Walk the output rows once and collect per-check violation messages."""
+    diag: dict[str, list[str]] = {
+        "missing_fields": [],
+        "negative": [],
+        "total_gt_possible": [],
+        "rate_out_of_range": [],
+        "rate_not_null": [],
+        "rate_mismatch": [],
+    }
+    for i, row in enumerate(output_data):
+        missing = [f for f in ("person_id", "govity_total", "govity_possible") if f not in row]
+        if missing:
+            diag["missing_fields"].append(f"Row {i} missing required field(s) {missing}")
+            continue
+        pid = row["person_id"]
+        total, possible, gv = row["govity_total"], row["govity_possible"], row.get("govity")
+        if total < 0 or possible < 0:
+            diag["negative"].append(f"Person {pid}: total={total}, possible={possible}")
+        if total > possible:
+            diag["total_gt_possible"].append(
+                f"Person {pid}: govity_total ({total}) > govity_possible ({possible})"
+            )
+        if gv is not None and not 0.0 <= gv <= 1.0:
+            diag["rate_out_of_range"].append(f"Person {pid}: govity {gv} out of [0,1]")
+        if possible == 0:
+            if gv is not None:
+                diag["rate_not_null"].append(f"Person {pid}: govity should be null when possible=0")
+        elif possible > 0:
+            expected = total / possible
+            if gv is None or abs(gv - round(expected, 6)) >= 1e-9:
+                diag["rate_mismatch"].append(f"Person {pid}: govity {gv} != {expected}")
+    return diag
+
+
+@pytest.fixture(scope="session")
+def gov_rows(output_data, definition) -> list[dict]:
+    """Rows with a govity value for members of a government group."""
+    gov_groups = frozenset(definition.get("government_groups") or ())
+    if not gov_groups:
+        return []
+    return [
+        row for row in output_data
+        if row.get("govity") is not None
+        and any(
+            o.get("id") in gov_groups and o.get("classification") == "group"
+            for o in (row.get("organizations") or ())
+        )
+    ]
+
+
+@pytest.fixture(scope="session")
+def persons_json() -> list[dict]:
+    """Parsed persons input, read once per session."""
+    return orjson.loads(TEST_PERSONS.read_bytes())
+
 
+@pytest.fixture(scope="session")
+def persons_input_ids(persons_json) -> frozenset[str]:
+    """IDs of all persons in the persons input."""
+    return frozenset(p["id"] for p in persons_json)
 
-@pytest.fixture(scope="module")
+
+@pytest.fixture(scope="session")
 def definition() -> dict:
-    with open(TEST_DEFINITION) as f:
-        return json.load(f)
+    return orjson.loads(TEST_DEFINITION.read_bytes())
 
 
 # ── Tests ──────────────────────────────────────────────────────────────────────
@@ -85,62 +202,43 @@ class TestOutputNotEmpty:
 
 
 class TestOutputSchema:
-    def test_validates_against_schema(self, output_data):
+    def test_validates_against_schema(self, output_data, govity_validator, govity_item_validator):
         """Output must validate against govity.dt.analyses JSON schema."""
-        with open(OUTPUT_SCHEMA_PATH) as f:
-            schema = json.load(f)
-        jsonschema.validate(instance=output_data, schema=schema)
+        if govity_item_validator is None:
+            govity_validator.validate(output_data)
+            return
+        # Validate row by row: stops at the first bad row and names it
+        for i, row in enumerate(output_data):
+            error = next(govity_item_validator.iter_errors(row), None)
+            assert error is None, (
+                f"Row {i} ({row.get('person_id')}) failed schema validation: {error.message}"
+            )
 
-    def test_required_fields_present(self, output_data):
+    def test_required_fields_present(self, row_diagnostics):
         """Every row must have person_id, govity_total, govity_possible."""
-        for i, row in enumerate(output_data):
-            for field in ("person_id", "govity_total", "govity_possible"):
-                assert field in row, f"Row {i} missing required field '{field}'"
+        assert not row_diagnostics["missing_fields"], row_diagnostics["missing_fields"]
 
 
 class TestGovityCounts:
-    def test_counts_non_negative(self, output_data):
+    def test_counts_non_negative(self, row_diagnostics):
         """govity_total and govity_possible must be non-negative integers."""
-        for row in output_data:
-            assert row["govity_total"] >= 0
-            assert row["govity_possible"] >= 0
+        assert not row_diagnostics["negative"], row_diagnostics["negative"]
 
-    def test_total_le_possible(self, output_data):
+    def test_total_le_possible(self, row_diagnostics):
         """govity_total must not exceed govity_possible."""
-        for row in output_data:
-            assert row["govity_total"] <= row["govity_possible"], (
-                f"Person {row['person_id']}: govity_total ({row['govity_total']}) "
-                f"> govity_possible ({row['govity_possible']})"
-            )
+        assert not row_diagnostics["total_gt_possible"], row_diagnostics["total_gt_possible"]
 
-    def test_govity_rate_range(self, output_data):
+    def test_govity_rate_range(self, row_diagnostics):
         """govity must be between 0 and 1 inclusive (or null when possible=0)."""
-        for row in output_data:
-            gv = row.get("govity")
-            if gv is not None:
-                assert 0.0 <= gv <= 1.0, (
-                    f"Person {row['person_id']}: govity {gv} out of [0,1]"
-                )
+        assert not row_diagnostics["rate_out_of_range"], row_diagnostics["rate_out_of_range"]
 
-    def test_govity_null_when_possible_zero(self, output_data):
+    def test_govity_null_when_possible_zero(self, row_diagnostics):
         """If govity_possible == 0, govity must be null."""
-        for row in output_data:
-            if row["govity_possible"] == 0:
-                assert row.get("govity") is None, (
-                    f"Person {row['person_id']}: govity should be null when possible=0"
-                )
+        assert not row_diagnostics["rate_not_null"], row_diagnostics["rate_not_null"]
 
-    def test_govity_consistent(self, output_data):
+    def test_govity_consistent(self, row_diagnostics):
         """govity must equal govity_total / govity_possible (within tolerance)."""
-        for row in output_data:
-            possible = row["govity_possible"]
-            gv = row.get("govity")
-            if possible > 0:
-                expected = row["govity_total"] / possible
-                assert gv is not None
-                assert abs(gv - round(expected, 6)) < 1e-9, (
-                    f"Person {row['person_id']}: govity {gv} != {expected}"
-                )
+        assert not row_diagnostics["rate_mismatch"], row_diagnostics["rate_mismatch"]
 
     def test_possible_varies_across_persons(self, output_data):
         """govity_possible should differ across persons (MPs absent from some events)."""
@@ -151,17 +249,8 @@ class TestGovityCounts:
 
 
 class TestGovernmentMembers:
-    def test_government_members_have_high_govity(self, output_data, definition):
+    def test_government_members_have_high_govity(self, gov_rows):
         """Government group members should have govity > 0.9 on average."""
-        gov_groups = set(definition.get("government_groups") or [])
-        gov_rows = [
-            row for row in output_data
-            if any(
-                o.get("id") in gov_groups and o.get("classification") == "group"
-                for o in (row.get("organizations") or [])
-            )
-            and row.get("govity") is not None
-        ]
         if gov_rows:
             avg = sum(r["govity"] for r in gov_rows) / len(gov_rows)
             assert avg > 0.9, (
@@ -170,28 +259,22 @@ class TestGovernmentMembers:
 
 
 class TestPersonCoverage:
-    def test_all_input_persons_in_output(self, output_data):
+    def test_all_input_persons_in_output(self, output_data, persons_input_ids):
         """Every person from the persons input must appear in the output."""
-        with open(TEST_PERSONS) as f:
-            persons = json.load(f)
-        input_ids = {p["id"] for p in persons}
         output_ids = {row["person_id"] for row in output_data}
-        missing = input_ids - output_ids
+        missing = persons_input_ids - output_ids
         assert missing == set(), f"These persons are missing from output: {missing}"
 
     def test_no_duplicate_person_ids(self, output_data):
         """Each person_id must appear at most once in the output."""
-        ids = [row["person_id"] for row in output_data]
-        duplicates = {pid for pid in ids if ids.count(pid) > 1}
+        counts = Counter(row["person_id"] for row in output_data)
+        duplicates = {pid for pid, n in counts.items() if n > 1}
         assert duplicates == set(), f"Duplicate person_ids in output: {duplicates}"
 
-    def test_no_extra_persons_in_output(self, output_data):
+    def test_no_extra_persons_in_output(self, output_data, persons_input_ids):
         """Output should not contain persons that were not in the persons input."""
-        with open(TEST_PERSONS) as f:
-            persons = json.load(f)
-        input_ids = {p["id"] for p in persons}
         output_ids = {row["person_id"] for row in output_data}
-        extra = output_ids - input_ids
+        extra = output_ids - persons_input_ids
         assert extra == set(), f"Output contains persons not in input: {extra}"
 
 
@@ -218,25 +301,76 @@ class TestExtras:
 
     def test_some_persons_have_image(self, output_data):
         """At least one person should carry an image URL from the persons input."""
-        images = [
-            row["extras"]["image"]
-            for row in output_data
-            if (row.get("extras") or {}).get("image")
-        ]
-        assert len(images) > 0, "No person has an image URL – check that persons input includes 'image' fields"
+        assert any(
+            (row.get("extras") or {}).get("image") for row in output_data
+        ), "No person has an image URL – check that persons input includes 'image' fields"
 
 
 class TestDateOverride:
-    def test_since_override_filters_events(self):
+    def test_since_override_filters_events(self, output_by_id, data_since):
         """--since flag should reduce or maintain the number of vote events counted."""
-        _, _, _, data_all = run_script()
-        _, _, _, data_since = run_script("--since", "2026-01-01")
-        assert data_since is not None
-
-        id_to_all = {r["person_id"]: r for r in data_all}
         for row in data_since:
             pid = row["person_id"]
-            if pid in id_to_all:
-                assert row["govity_possible"] <= id_to_all[pid]["govity_possible"], (
+            if pid in output_by_id:
+                assert row["govity_possible"] <= output_by_id[pid]["govity_possible"], (
                     f"Person {pid}: govity_possible increased with --since filter"
                 )
+
+
+class TestMinimalInactive:
+    def test_only_inactive_rows_are_trimmed(self, output_data):
+        """minimal_inactive must leave active rows intact and keep counts for inactive ones."""
+        minimal = list(run(*_INPUT_PATHS, minimal_inactive=True))
+        assert len(minimal) == len(output_data)
+        for full, row in zip(output_data, minimal):
+            if full["govity_possible"] > 0:
+                assert row == full
+            else:
+                assert "organizations" not in row and "extras" not in row
+                assert row == {k: v for k, v in full.items() if k in row}
+
+
+class TestCli:
+    def test_cli_smoke(self, output_data):
+        """Running the script end to end must produce the same records."""
+        rc, stdout, stderr, data = run_script()
+        assert rc == 0, (
+            f"Script failed:\nSTDOUT: {stdout.decode('utf-8', 'replace')}"
+            f"\nSTDERR: {stderr.decode('utf-8', 'replace')}"
+        )
+        assert data == output_data
+
+
+class TestIterVotesCsv:
+    def test_blank_lines_skipped(self, tmp_path):
+        """Blank lines in votes.csv are ignored, as csv.DictReader ignores them."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\n\nve1,p2,no\n\n")
+        assert list(iter_votes(str(path))) == [("ve1", "p1", "yes"), ("ve1", "p2", "no")]
+
+    def test_short_row_exits_cleanly(self, tmp_path):
+        """A row with fewer fields than the header stops with a message, not a traceback."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\nve1,p2\n")
+        with pytest.raises(SystemExit, match="row 1 has 2 field"):
+            list(iter_votes(str(path)))
+
+    def test_json_row_missing_field_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row without voter_id stops with a message, not a KeyError."""
+        path = tmp_path / "votes.json"
+        path.write_bytes(orjson.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": "ve1", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path)))
+
+    def test_json_row_null_id_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row with a null id stops with a message, not a TypeError."""
+        path = tmp_path / "votes.json"
+        path.write_bytes(orjson.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": None, "voter_id": "p2", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path)))
@@ -11,17 +11,44 @@ Usage:
 
 import argparse
 import csv
-import json
 import sys
 
+import orjson
 
-def newest_name(organizations: list[dict], classification: str) -> str:
-    """Return the name of the most recently started org of the given classification."""
-    matches = [o for o in organizations if o.get("classification") == classification]
-    if not matches:
-        return ""
-    matches.sort(key=lambda o: o.get("since") or "", reverse=True)
-    return matches[0].get("name") or ""
+
+def newest_names(organizations: list[dict]) -> dict[str, str]:
+    """Return {classification: name of the most recently started org} in one pass.
+
+    Entries without a date are treated as oldest; on equal dates the first
+    entry wins.
+    """
+    best: dict[str, tuple[str, str]] = {}
+    for o in organizations:
+        classification = o.get("classification")
+        since = o.get("since") or ""
+        current = best.get(classification)
+        if current is None or since > current[0]:
+            best[classification] = (since, o.get("name") or "")
+    return {classification: name for classification, (_, name) in best.items()}
+
+
+def _rows(data: list[dict]):
+    """Yield one CSV row tuple per person, in fieldnames order."""
+    for row in data:
+        newest = newest_names(row.get("organizations") or [])
+        rb = row.get("rebelity")
+        yield (
+            row["person_id"],                                # id
+            row.get("name") or "",                           # name
+            (row.get("extras") or {}).get("image") or "",    # photo
+            newest.get("candidate_list", ""),                # candidate_list
+            newest.get("group", ""),                         # group
+            newest.get("constituency", ""),                  # constituency
+            rb if rb is not None else "",                    # rebelity
+            round(rb * 100, 1) if rb is not None else "",    # rebelity_percent
+            row["rebelity_total"],                           # rebelity_total
+            row["rebelity_possible"],                        # rebelity_possible
+        )
 
 
 def main() -> None:
@@ -32,8 +59,8 @@ def main() -> None:
     parser.add_argument("--output", required=True, help="Path to write output CSV")
     args = parser.parse_args()
 
-    with open(args.input) as f:
-        data = json.load(f)
+    with open(args.input, "rb") as f:
+        data = orjson.loads(f.read())
 
     fieldnames = [
         "id",
@@ -48,24 +75,12 @@ def main() -> None:
         "rebelity_possible",
     ]
 
-    with open(args.output, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in data:
-            orgs = row.get("organizations") or []
-            rb = row.get("rebelity")
-            writer.writerow({
-                "id":                row["person_id"],
-                "name":              row.get("name") or "",
-                "photo":             (row.get("extras") or {}).get("image") or "",
-                "candidate_list":    newest_name(orgs, "candidate_list"),
-                "group":             newest_name(orgs, "group"),
-                "constituency":      newest_name(orgs, "constituency"),
-                "rebelity":          rb if rb is not None else "",
-                "rebelity_percent":  round(rb * 100, 1) if rb is not None else "",
-                "rebelity_total":    row["rebelity_total"],
-                "rebelity_possible": row["rebelity_possible"],
-            })
+    # 1 MiB buffer: rows are small, so flush to disk in large chunks
+    with open(args.output, "w", newline="", buffering=1 << 20) as f:
+        # Positional rows: no per-row dict to build and map back onto fieldnames
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(_rows(data))
 
     print(f"Wrote {len(data)} rows to {args.output}", file=sys.stderr)
 
@@ -12,6 +12,8 @@ Inputs (all named CLI parameters):
 Optional:
   --since        ISO date (YYYY-MM-DD) — overrides definition's since
   --until        ISO date (YYYY-MM-DD) — overrides definition's until
+  --validate-sample N  validate every N-th votes row (default 1000)
+  --strict-validate    validate every votes row
 
 Output (one row per person):
   person_id, name, given_names, family_names, organizations,
@@ -31,12 +33,17 @@ Rebelity denominator = vote events where group had a clear direction (≠ 0),
 
 import argparse
 import csv
-import json
+import functools
 import sys
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
+from operator import itemgetter
 from pathlib import Path
 
 import jsonschema
+import orjson
 
 
 # ── Schema paths ───────────────────────────────────────────────────────────────
@@ -51,10 +58,20 @@ SCHEMA_PATHS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def load_schema(key: str) -> dict:
     path = SCHEMA_PATHS[key]
-    with open(path) as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(key: str) -> jsonschema.protocols.Validator:
+    """Validator for SCHEMA_PATHS[key]; the schema itself is checked once, here."""
+    schema = load_schema(key)
+    validator_cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
 
 
 # ── Loaders ────────────────────────────────────────────────────────────────────
@@ -63,8 +80,8 @@ def load_json_or_csv(path: str) -> list | dict:
     p = Path(path)
     suffix = p.suffix.lower()
     if suffix == ".json":
-        with open(p) as f:
-            return json.load(f)
+        with open(p, "rb") as f:
+            return orjson.loads(f.read())
     elif suffix == ".csv":
         with open(p, newline="") as f:
             return list(csv.DictReader(f))
@@ -73,13 +90,11 @@ def load_json_or_csv(path: str) -> list | dict:
 
 
 def load_definition(path: str) -> dict:
-    with open(path) as f:
-        data = json.load(f)
-    schema = load_schema("definition")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"Definition '{path}' failed schema validation: {e.message}")
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
+    error = jsonschema.exceptions.best_match(get_validator("definition").iter_errors(data))
+    if error is not None:
+        sys.exit(f"Definition '{path}' failed schema validation: {error.message}")
     return data
 
 
@@ -87,33 +102,78 @@ def load_vote_events(path: str) -> list[dict]:
     data = load_json_or_csv(path)
     if not isinstance(data, list):
         sys.exit(f"vote_events '{path}' must be a JSON array")
-    schema = load_schema("vote_events")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"vote_events '{path}' failed schema validation: {e.message}")
+    error = jsonschema.exceptions.best_match(get_validator("vote_events").iter_errors(data))
+    if error is not None:
+        sys.exit(f"vote_events '{path}' failed schema validation: {error.message}")
     return data
 
 
-def load_votes(path: str) -> list[dict]:
-    data = load_json_or_csv(path)
-    if not isinstance(data, list):
-        sys.exit(f"votes '{path}' must be a list/array")
-    row_schema = load_schema("votes_row")
-    validator = jsonschema.Draft7Validator(row_schema)
-    for i, row in enumerate(data):
-        row_errors = list(validator.iter_errors(dict(row)))
-        if row_errors:
-            sys.exit(f"votes '{path}' row {i} failed schema validation: {row_errors[0].message}")
-    return data
+VOTE_COLUMNS = ("vote_event_id", "voter_id", "option")
+
+
+DEFAULT_VALIDATE_SAMPLE = 1000
+
+
+def iter_votes(path: str, sample_every: int = DEFAULT_VALIDATE_SAMPLE) -> Iterator[tuple[str, str, str]]:
+    """Yield votes as (vote_event_id, voter_id, option) tuples.
+
+    CSV is streamed with csv.reader and projected to the three columns the
+    calculation uses, so the votes table is never held in memory as a whole.
+    The first row and every sample_every-th row after it are validated against
+    the votes-table schema; sample_every=1 validates every row. The ids and
+    options repeat across millions of rows, so they are interned: duplicates
+    share one string object and dict lookups hit the identity fast path.
+    """
+    intern = sys.intern
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix not in (".csv", ".json"):
+        raise ValueError(f"Unsupported extension '{suffix}' for {path}")
+    validator = get_validator("votes_row")
+    with open(p, newline="") as f:
+        if suffix == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            missing = [c for c in VOTE_COLUMNS if c not in header]
+            if missing:
+                sys.exit(f"votes '{path}' is missing column(s): {', '.join(missing)}")
+            vid_i, voter_i, option_i = (header.index(c) for c in VOTE_COLUMNS)
+            width = len(header)
+            # Blank lines are skipped, as csv.DictReader does; rows are
+            # numbered without them
+            for i, row in enumerate(row for row in reader if row):
+                if len(row) < width:
+                    sys.exit(f"votes '{path}' row {i} has {len(row)} field(s), expected {width}")
+                if i % sample_every == 0:
+                    # Stop at the first error instead of collecting them all
+                    error = next(validator.iter_errors(dict(zip(header, row))), None)
+                    if error is not None:
+                        sys.exit(f"votes '{path}' row {i} failed schema validation: {error.message}")
+                yield intern(row[vid_i]), intern(row[voter_i]), intern(row[option_i])
+        else:
+            data = orjson.loads(f.read())
+            if not isinstance(data, list):
+                sys.exit(f"votes '{path}' must be a list/array")
+            for i, row in enumerate(data):
+                if i % sample_every == 0:
+                    # JSON rows are dicts already; validate them without copying
+                    error = next(validator.iter_errors(row), None)
+                    if error is not None:
+                        sys.exit(f"votes '{path}' row {i} failed schema validation: {error.message}")
+                # Unsampled rows are not validated, but the columns read below must be strings
+                if not isinstance(row, dict) or not all(isinstance(row.get(c), str) for c in VOTE_COLUMNS):
+                    sys.exit(f"votes '{path}' row {i} must have string {', '.join(VOTE_COLUMNS)} fields")
+                yield intern(row["vote_event_id"]), intern(row["voter_id"]), intern(row["option"])
 
 
 def _parse_memberships_csv(raw: str) -> dict:
     if not raw or raw.strip() in ("", "{}"):
         return {}
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return {}
 
 
@@ -122,13 +182,13 @@ def load_persons(path: str) -> list[dict]:
     if p.suffix.lower() == ".csv":
         with open(p, newline="") as f:
             rows = []
-            for row in csv.DictReader(f):
-                person = dict(row)
+            # DictReader rows are fresh dicts, so they are updated in place
+            for person in csv.DictReader(f):
                 for field in ("identifiers", "sources", "other_names"):
                     if field in person and person[field]:
                         try:
-                            person[field] = json.loads(person[field])
-                        except (json.JSONDecodeError, TypeError):
+                            person[field] = orjson.loads(person[field])
+                        except (orjson.JSONDecodeError, TypeError):
                             person[field] = []
                 if "memberships" in person:
                     person["memberships"] = _parse_memberships_csv(person["memberships"])
@@ -138,23 +198,29 @@ def load_persons(path: str) -> list[dict]:
                 rows.append(person)
         data = rows
     else:
-        with open(p) as f:
-            data = json.load(f)
+        with open(p, "rb") as f:
+            data = orjson.loads(f.read())
     if not isinstance(data, list):
         sys.exit(f"persons '{path}' must be an array")
-    schema = load_schema("persons")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"persons '{path}' failed schema validation: {e.message}")
+    error = jsonschema.exceptions.best_match(get_validator("persons").iter_errors(data))
+    if error is not None:
+        sys.exit(f"persons '{path}' failed schema validation: {error.message}")
     return data
 
 
 # ── Date helpers ───────────────────────────────────────────────────────────────
 
+# Cached: membership and event dates repeat across many persons and events
+@functools.lru_cache(maxsize=None)
 def parse_date_prefix(s: str | None) -> date | None:
     if not s:
         return None
+    if len(s) == 10:
+        # Plain YYYY-MM-DD, the usual case: parse as a date directly
+        try:
+            return date.fromisoformat(s)
+        except ValueError:
+            return None
     try:
         return datetime.fromisoformat(s).date()
     except ValueError:
@@ -164,7 +230,15 @@ def parse_date_prefix(s: str | None) -> date | None:
             return None
 
 
-def in_date_range(d: date | None, since: date | None, until: date | None) -> bool:
+@functools.lru_cache(maxsize=None)
+def parse_date_ordinal(s: str | None) -> int | None:
+    """parse_date_prefix(s) as a proleptic ordinal (date.toordinal()), or None."""
+    d = parse_date_prefix(s)
+    return d.toordinal() if d is not None else None
+
+
+def in_date_range(d: int | None, since: int | None, until: int | None) -> bool:
+    # Dates are compared as ordinals (see parse_date_ordinal)
     if d is None:
         return True
     if since is not None and d < since:
@@ -176,32 +250,50 @@ def in_date_range(d: date | None, since: date | None, until: date | None) -> boo
 
 # ── Group membership lookup ────────────────────────────────────────────────────
 
-def build_group_memberships(persons: list[dict]) -> dict[str, list[tuple]]:
-    """Returns {person_id: [(group_id, start_date, end_date), ...]} sorted by start desc."""
-    result: dict[str, list[tuple]] = {}
+# Per person: (starts, ends, group_ids) as parallel lists sorted by start ascending.
+# Dates are ordinals; open bounds are stored as the sentinels below, so lookups
+# compare plain ints without None checks.
+GroupMemberships = dict[str, tuple[list[int], list[int], list[str]]]
+
+_OPEN_START = date.min.toordinal()
+_OPEN_END = date.max.toordinal()
+
+
+def build_group_memberships(persons: list[dict]) -> GroupMemberships:
+    """Returns {person_id: (starts, ends, group_ids)} with open bounds as _OPEN_START / _OPEN_END."""
+    result: GroupMemberships = {}
     for p in persons:
-        pid = p.get("id") or p.get("person_id", "")
+        pid = sys.intern(p.get("id") or p.get("person_id", ""))
         groups = (p.get("memberships") or {}).get("groups") or []
         entries = []
         for g in groups:
             gid = g.get("id")
             if not gid:
                 continue
-            entries.append((gid, parse_date_prefix(g.get("start_date")), parse_date_prefix(g.get("end_date"))))
-        entries.sort(key=lambda t: t[1] or date.min, reverse=True)
-        result[pid] = entries
+            gid = sys.intern(gid)
+            start, end = parse_date_ordinal(g.get("start_date")), parse_date_ordinal(g.get("end_date"))
+            entries.append((gid, _OPEN_START if start is None else start, _OPEN_END if end is None else end))
+        # Reversed first so that, walking back from the end, entries with equal
+        # starts come out in their original order
+        entries = sorted(reversed(entries), key=itemgetter(1))
+        result[pid] = ([t[1] for t in entries], [t[2] for t in entries], [t[0] for t in entries])
     return result
 
 
-def get_group_at_date(person_id: str, event_date: date | None,
-                      group_memberships: dict[str, list[tuple]]) -> str | None:
-    for (gid, start, end) in group_memberships.get(person_id, []):
-        if event_date is not None:
-            if start is not None and event_date < start:
-                continue
-            if end is not None and event_date > end:
-                continue
-        return gid
+def get_group_at_date(person_id: str, event_date: int | None,
+                      group_memberships: GroupMemberships) -> str | None:
+    """Group of the latest-starting membership covering event_date (the latest-starting one if no date)."""
+    entry = group_memberships.get(person_id)
+    if not entry or not entry[2]:
+        return None
+    starts, ends, gids = entry
+    if event_date is None:
+        return gids[-1]
+    # Binary search for the memberships starting on or before the date, then
+    # walk back newest first; usually the first one covers it
+    for j in range(bisect_right(starts, event_date) - 1, -1, -1):
+        if event_date <= ends[j]:
+            return gids[j]
     return None
 
 
@@ -230,12 +322,52 @@ def vote_value_active(option: str, yes_opts: set[str], no_opts: set[str]) -> int
     return 0
 
 
+def _build_vote_tables(definition: dict) -> dict[str, tuple[int, int]]:
+    """{option: (vote_value, vote_value_active)} for every option the definition lists.
+
+    Options not in the table have value 0 and active 0.
+    """
+    present_opts = set(definition["present_options"])
+    yes_opts = set(definition["yes_options"])
+    no_opts  = set(definition["no_options"])
+    return {
+        opt: (vote_value(opt, yes_opts, no_opts, present_opts), vote_value_active(opt, yes_opts, no_opts))
+        for opt in yes_opts | no_opts | present_opts
+    }
+
+
 # ── Core calculation ───────────────────────────────────────────────────────────
 
+def _tally_rebelity(
+    p_active: dict[str, int],
+    groups_on: dict[int | None, str | None],
+    valid_events: dict[str, int | None],
+    group_direction: dict[tuple[str, str], int],
+    directed_on: dict[tuple[int | None, str], int],
+) -> tuple[int, int]:
+    """(rebelity_total, rebelity_possible) for one person's {event_id: active vote value} votes.
+
+    groups_on maps each event date to the person's group on that date;
+    directed_on counts the events with a clear group direction per (date, group).
+    """
+    # Possible: every directed event of the person's group, voted in or not,
+    # summed per date instead of walking all events
+    possible = sum(directed_on.get((d, gid), 0) for d, gid in groups_on.items() if gid)
+    # Total: only events the person actually voted in can be rebel votes
+    total = 0
+    for eid, active in p_active.items():
+        if not active:
+            continue
+        gid = groups_on.get(valid_events[eid])
+        if gid and active * group_direction.get((eid, gid), 0) == -1:
+            total += 1
+    return total, possible
+
+
 def calculate_rebelity(
     definition: dict,
     vote_events: list[dict],
-    votes: list[dict],
+    votes: Iterable[tuple[str, str, str]],
     persons: list[dict],
     since_override: date | None,
     until_override: date | None,
@@ -243,65 +375,71 @@ def calculate_rebelity(
 
     since_date = since_override or parse_date_prefix(definition.get("since"))
     until_date = until_override or parse_date_prefix(definition.get("until"))
-    present_opts = set(definition["present_options"])
-    yes_opts = set(definition["yes_options"])
-    no_opts  = set(definition["no_options"])
-
-    # Filter valid vote events in date range
-    valid_events: dict[str, date | None] = {}
+    option_values = _build_vote_tables(definition)
+
+    # Filter valid vote events in date range. Event dates are kept as ordinals;
+    # open bounds become the sentinels, so the range test is one chained
+    # comparison (same result as in_date_range)
+    lo = since_date.toordinal() if since_date is not None else _OPEN_START
+    hi = until_date.toordinal() if until_date is not None else _OPEN_END
+    valid_events: dict[str, int | None] = {}
     for ev in vote_events:
         if ev.get("status", "valid") in ("invalid", "test"):
             continue
-        ev_date = parse_date_prefix(ev.get("start_date"))
-        if in_date_range(ev_date, since_date, until_date):
-            valid_events[ev["id"]] = ev_date
-
-    # Index votes by event and by person
-    votes_by_event: dict[str, list[tuple[str, str]]] = {}
-    person_vote: dict[str, dict[str, str]] = {}
-    for row in votes:
-        eid = row["vote_event_id"]
-        if eid not in valid_events:
-            continue
-        pid, opt = row["voter_id"], row["option"]
-        votes_by_event.setdefault(eid, []).append((pid, opt))
-        person_vote.setdefault(pid, {})[eid] = opt
+        ev_date = parse_date_ordinal(ev.get("start_date"))
+        if ev_date is None or lo <= ev_date <= hi:
+            valid_events[sys.intern(ev["id"])] = ev_date
 
     group_memberships = build_group_memberships(persons)
 
-    # Compute group direction per (event, group)
-    group_direction: dict[tuple[str, str], int] = {}
-    for eid, ev_date in valid_events.items():
-        group_sums: dict[str, int] = {}
-        for (pid, opt) in votes_by_event.get(eid, []):
-            val = vote_value(opt, yes_opts, no_opts, present_opts)
-            gid = get_group_at_date(pid, ev_date, group_memberships)
-            if gid:
-                group_sums[gid] = group_sums.get(gid, 0) + val
-        for gid, s in group_sums.items():
-            group_direction[(eid, gid)] = 1 if s > 0 else (-1 if s < 0 else 0)
+    # Each person's group on every distinct event date, resolved once up front
+    # so neither pass below searches memberships per (event, person)
+    event_dates = set(valid_events.values())
+    group_on: dict[str, dict[int | None, str | None]] = {
+        pid: {d: get_group_at_date(pid, d, group_memberships) for d in event_dates}
+        for pid, (_, _, gids) in group_memberships.items()
+        if gids
+    }
+    no_groups: dict[int | None, str | None] = {}
+
+    # One pass over the votes: index them by person and scatter-add each vote
+    # value into its (event, group) sum, instead of regrouping votes per event.
+    # Options are resolved to ints here, so later passes never see the strings.
+    # (defaultdicts avoid setdefault's throwaway dict and get's second lookup)
+    person_active: defaultdict[str, dict[str, int]] = defaultdict(dict)
+    group_sums: defaultdict[tuple[str, str], int] = defaultdict(int)
+    for eid, pid, opt in votes:
+        if eid not in valid_events:
+            continue
+        value, active = option_values.get(opt, (0, 0))
+        person_active[pid][eid] = active
+        gid = group_on.get(pid, no_groups).get(valid_events[eid])
+        if gid:
+            group_sums[eid, gid] += value
+
+    # Group direction per (event, group); pairs without votes default to 0
+    group_direction: dict[tuple[str, str], int] = {
+        key: (s > 0) - (s < 0) for key, s in group_sums.items()
+    }
+
+    # Number of events with a clear direction per (event date, group)
+    directed_on: defaultdict[tuple[int | None, str], int] = defaultdict(int)
+    for (eid, gid), gdir in group_direction.items():
+        if gdir:
+            directed_on[valid_events[eid], gid] += 1
 
     # Build output
     output: list[dict] = []
     for person in persons:
         pid = person.get("id") or person.get("person_id", "")
-        rebelity_total = 0
-        rebelity_possible = 0
-        p_votes = person_vote.get(pid, {})
-
-        for eid, ev_date in valid_events.items():
-            gid = get_group_at_date(pid, ev_date, group_memberships)
-            if not gid:
-                continue
-            gdir = group_direction.get((eid, gid), 0)
-            if gdir == 0:
-                continue
-            rebelity_possible += 1
-            opt = p_votes.get(eid)
-            if opt is not None:
-                active = vote_value_active(opt, yes_opts, no_opts)
-                if active * gdir == -1:
-                    rebelity_total += 1
+        groups_on = group_on.get(pid)
+        if groups_on is None:
+            # Never in a group: no group direction to follow or rebel against
+            rebelity_total = rebelity_possible = 0
+        else:
+            rebelity_total, rebelity_possible = _tally_rebelity(
+                person_active.get(pid, {}), groups_on, valid_events, group_direction, directed_on,
+            )
 
         row: dict = {
             "person_id":         pid,
@@ -369,7 +507,14 @@ def main() -> None:
     parser.add_argument("--output",      required=True)
     parser.add_argument("--since",       default=None)
     parser.add_argument("--until",       default=None)
+    parser.add_argument("--validate-sample", type=int, default=DEFAULT_VALIDATE_SAMPLE, metavar="N",
+                        help=f"Validate every N-th votes row (default {DEFAULT_VALIDATE_SAMPLE})")
+    parser.add_argument("--strict-validate", action="store_true",
+                        help="Validate every votes row (overrides --validate-sample)")
     args = parser.parse_args()
+    if args.validate_sample < 1:
+        parser.error("--validate-sample must be at least 1")
+    sample_every = 1 if args.strict_validate else args.validate_sample
 
     since_override = parse_date_prefix(args.since)
     until_override = parse_date_prefix(args.until)
@@ -378,17 +523,16 @@ def main() -> None:
     definition = load_definition(args.definition)
     print("Loading vote_events...", file=sys.stderr)
     vote_events = load_vote_events(args.vote_events)
-    print("Loading votes...",       file=sys.stderr)
-    votes = load_votes(args.votes)
     print("Loading persons...",     file=sys.stderr)
     persons = load_persons(args.persons)
-    print("Calculating...",         file=sys.stderr)
-    output = calculate_rebelity(definition, vote_events, votes, persons, since_override, until_override)
+    # Votes are read once, so they are streamed through the calculation
+    print("Streaming votes and calculating...", file=sys.stderr)
+    output = calculate_rebelity(definition, vote_events, iter_votes(args.votes, sample_every), persons, since_override, until_override)
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with open(out_path, "wb") as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     print(f"Done. Wrote {len(output)} records to {args.output}", file=sys.stderr)
 
 
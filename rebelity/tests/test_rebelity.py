@@ -11,11 +11,16 @@ import json
 import subprocess
 import sys
 import tempfile
+from collections import Counter
 from pathlib import Path
 
 import jsonschema
 import pytest
 
+# Import the analysis module directly
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from rebelity import iter_votes
+
 # ── Path constants ─────────────────────────────────────────────────────────────
 
 REPO_ROOT = Path(__file__).parent.parent.parent.parent  # legislature-data/
@@ -66,6 +71,12 @@ def output_data() -> list[dict]:
     return data
 
 
+@pytest.fixture(scope="module")
+def output_by_id(output_data) -> dict[str, dict]:
+    """output_data keyed by person_id, for direct lookups instead of list scans."""
+    return {row["person_id"]: row for row in output_data}
+
+
 @pytest.fixture(scope="module")
 def definition() -> dict:
     with open(TEST_DEFINITION) as f:
@@ -162,8 +173,8 @@ class TestPersonCoverage:
 
     def test_no_duplicate_person_ids(self, output_data):
         """Each person_id must appear at most once in the output."""
-        ids = [row["person_id"] for row in output_data]
-        duplicates = {pid for pid in ids if ids.count(pid) > 1}
+        counts = Counter(row["person_id"] for row in output_data)
+        duplicates = {pid for pid, n in counts.items() if n > 1}
         assert duplicates == set(), f"Duplicate person_ids in output: {duplicates}"
 
     def test_no_extra_persons_in_output(self, output_data):
@@ -208,17 +219,50 @@ class TestExtras:
 
 
 class TestDateOverride:
-    def test_since_override_filters_events(self):
+    def test_since_override_filters_events(self, output_by_id):
         """--since flag should reduce or maintain the number of vote events counted."""
-        _, _, _, data_all = run_script()
         _, _, _, data_since = run_script("--since", "2026-01-01")
         assert data_since is not None
 
         # Persons with data_since should have rebelity_possible <= full run
-        id_to_all = {r["person_id"]: r for r in data_all}
         for row in data_since:
             pid = row["person_id"]
-            if pid in id_to_all:
-                assert row["rebelity_possible"] <= id_to_all[pid]["rebelity_possible"], (
+            if pid in output_by_id:
+                assert row["rebelity_possible"] <= output_by_id[pid]["rebelity_possible"], (
                     f"Person {pid}: possible increased with --since filter"
                 )
+
+
+class TestIterVotesCsv:
+    def test_blank_lines_skipped(self, tmp_path):
+        """Blank lines in votes.csv are ignored, as csv.DictReader ignores them."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\n\nve1,p2,no\n\n")
+        assert list(iter_votes(str(path))) == [("ve1", "p1", "yes"), ("ve1", "p2", "no")]
+
+    def test_short_row_exits_cleanly(self, tmp_path):
+        """A row with fewer fields than the header stops with a message, not a traceback."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\nve1,p2\n")
+        with pytest.raises(SystemExit, match="row 1 has 2 field"):
+            list(iter_votes(str(path)))
+
+    def test_json_row_missing_field_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row without voter_id stops with a message, not a KeyError."""
+        path = tmp_path / "votes.json"
+        path.write_text(json.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": "ve1", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path)))
+
+    def test_json_row_null_id_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row with a null id stops with a message, not a TypeError."""
+        path = tmp_path / "votes.json"
+        path.write_text(json.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": None, "voter_id": "p2", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path)))
@@ -16,12 +16,15 @@ import json
 import sys
 
 
-def newest_name(organizations: list[dict], classification: str) -> str:
-    matches = [o for o in organizations if o.get("classification") == classification]
-    if not matches:
-        return ""
-    matches.sort(key=lambda o: o.get("since") or "", reverse=True)
-    return matches[0].get("name") or ""
+def newest_names(organizations: list[dict]) -> dict[str, str]:
+    best: dict[str, tuple[str, str]] = {}
+    for o in organizations:
+        classification = o.get("classification")
+        since = o.get("since") or ""
+        current = best.get(classification)
+        if current is None or since > current[0]:
+            best[classification] = (since, o.get("name") or "")
+    return {classification: name for classification, (_, name) in best.items()}
 
 
 def main() -> None:
@@ -50,26 +53,26 @@ def main() -> None:
     ]
 
     with open(args.output, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
         for row in data:
-            orgs = row.get("organizations") or []
+            newest = newest_names(row.get("organizations") or [])
             total = row["corrections_total"]
             vote_total = row["vote_events_total"]
             correction_rate = round(total / vote_total, 6) if vote_total > 0 else ""
-            writer.writerow({
-                "id":                     row["person_id"],
-                "name":                   row.get("name") or "",
-                "photo":                  (row.get("extras") or {}).get("image") or "",
-                "candidate_list":         newest_name(orgs, "candidate_list"),
-                "group":                  newest_name(orgs, "group"),
-                "constituency":           newest_name(orgs, "constituency"),
-                "corrections_total":      total,
-                "corrections_invalidated": row["corrections_invalidated"],
-                "corrections_announced":  row["corrections_announced"],
-                "vote_events_total":      vote_total,
-                "correction_rate":        correction_rate,
-            })
+            writer.writerow((
+                row["person_id"],                                # id
+                row.get("name") or "",                           # name
+                (row.get("extras") or {}).get("image") or "",    # photo
+                newest.get("candidate_list", ""),                # candidate_list
+                newest.get("group", ""),                         # group
+                newest.get("constituency", ""),                  # constituency
+                total,                                           # corrections_total
+                row["corrections_invalidated"],                  # corrections_invalidated
+                row["corrections_announced"],                    # corrections_announced
+                vote_total,                                      # vote_events_total
+                correction_rate,                                 # correction_rate
+            ))
 
     print(f"Wrote {len(data)} rows to {args.output}", file=sys.stderr)
 
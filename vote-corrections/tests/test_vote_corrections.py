@@ -12,13 +12,15 @@ Run with:
 import json
 import sys
 import tempfile
+import time
 from pathlib import Path
 
+import orjson
 import pytest
 
 # Import the analysis module directly
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from vote_corrections import calculate_vote_corrections, parse_date_prefix
+from vote_corrections import calculate_vote_corrections, iter_votes, parse_date_prefix, write_output
 
 
 # ── Fixtures ───────────────────────────────────────────────────────────────────
@@ -50,6 +52,9 @@ VOTES = [
     {"voter_id": "p3", "vote_event_id": "ve5", "option": "yes"},
 ]
 
+# The calculation takes votes as (vote_event_id, voter_id) tuples, as iter_votes yields them
+VOTE_ROWS = [(v["vote_event_id"], v["voter_id"]) for v in VOTES]
+
 OBJECTIONS = [
     # p1 corrected ve1 — only announced
     {"id": "obj1", "vote_event_id": "ve1", "type": "vote_correction",
@@ -76,7 +81,7 @@ OBJECTIONS = [
 @pytest.fixture
 def result():
     return calculate_vote_corrections(
-        OBJECTIONS, VOTE_EVENTS, VOTES, PERSONS,
+        OBJECTIONS, VOTE_EVENTS, VOTE_ROWS, PERSONS,
         since_date=None, until_date=None,
     )
 
@@ -175,6 +180,14 @@ class TestVoteEventsTotal:
         for row in result:
             assert row["vote_events_total"] >= 0
 
+    def test_duplicate_vote_rows_counted_once(self):
+        # vote_events_total counts distinct events, not rows
+        result = calculate_vote_corrections(
+            [], VOTE_EVENTS, VOTE_ROWS + VOTE_ROWS, PERSONS, None, None,
+        )
+        by_id = {r["person_id"]: r for r in result}
+        assert by_id["p1"]["vote_events_total"] == 3
+
 
 # ── Date filtering ─────────────────────────────────────────────────────────────
 
@@ -182,7 +195,7 @@ class TestDateFiltering:
     def test_since_excludes_earlier_events(self):
         # since 2025-01-12: only ve3 (2025-01-12) and ve4 (2025-01-13) are valid
         result = calculate_vote_corrections(
-            OBJECTIONS, VOTE_EVENTS, VOTES, PERSONS,
+            OBJECTIONS, VOTE_EVENTS, VOTE_ROWS, PERSONS,
             since_date=parse_date_prefix("2025-01-12"),
             until_date=None,
         )
@@ -195,7 +208,7 @@ class TestDateFiltering:
     def test_until_excludes_later_events(self):
         # until 2025-01-11: ve1 (valid) and ve2 (invalid) are in range
         result = calculate_vote_corrections(
-            OBJECTIONS, VOTE_EVENTS, VOTES, PERSONS,
+            OBJECTIONS, VOTE_EVENTS, VOTE_ROWS, PERSONS,
             since_date=None,
             until_date=parse_date_prefix("2025-01-11"),
         )
@@ -207,7 +220,7 @@ class TestDateFiltering:
 
     def test_since_until_written_to_output(self):
         result = calculate_vote_corrections(
-            OBJECTIONS, VOTE_EVENTS, VOTES, PERSONS,
+            OBJECTIONS, VOTE_EVENTS, VOTE_ROWS, PERSONS,
             since_date=parse_date_prefix("2025-01-01"),
             until_date=parse_date_prefix("2025-12-31"),
         )
@@ -243,3 +256,112 @@ class TestPersonMetadata:
         result = calculate_vote_corrections([], VOTE_EVENTS, [], persons_with_image, None, None)
         row = result[0]
         assert row.get("extras", {}).get("image") == "https://example.com/photo.jpg"
+
+
+# ── Votes CSV reading ──────────────────────────────────────────────────────────
+
+class TestIterVotesCsv:
+    def test_blank_lines_skipped(self, tmp_path):
+        """Blank lines in votes.csv are ignored, as csv.DictReader ignores them."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\n\nve1,p2,no\n\n")
+        assert list(iter_votes(str(path), sample_every=0)) == [("ve1", "p1"), ("ve1", "p2")]
+
+    def test_short_row_exits_cleanly(self, tmp_path):
+        """A row with fewer fields than the header stops with a message, not a traceback."""
+        path = tmp_path / "votes.csv"
+        path.write_text("vote_event_id,voter_id,option\nve1,p1,yes\nve1,p2\n")
+        with pytest.raises(SystemExit, match="row 1 has 2 field"):
+            list(iter_votes(str(path), sample_every=0))
+
+    def test_json_row_missing_field_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row without voter_id stops with a message, not a KeyError."""
+        path = tmp_path / "votes.json"
+        path.write_text(json.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": "ve1", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path), sample_every=0))
+
+    def test_json_row_null_id_exits_cleanly(self, tmp_path):
+        """An unsampled JSON row with a null id stops with a message, not a TypeError."""
+        path = tmp_path / "votes.json"
+        path.write_text(json.dumps([
+            {"vote_event_id": "ve1", "voter_id": "p1", "option": "yes"},
+            {"vote_event_id": None, "voter_id": "p2", "option": "no"},
+        ]))
+        with pytest.raises(SystemExit, match="row 1 must have string"):
+            list(iter_votes(str(path), sample_every=0))
+
+
+# ── Output writing ─────────────────────────────────────────────────────────────
+
+class TestWriteOutput:
+    def test_matches_whole_document_dump(self, result, tmp_path):
+        out = tmp_path / "out.json"
+        assert write_output(iter(result), out) == len(result)
+        assert out.read_bytes() == orjson.dumps(result, option=orjson.OPT_INDENT_2)
+
+    def test_empty(self, tmp_path):
+        out = tmp_path / "out.json"
+        assert write_output([], out) == 0
+        assert json.loads(out.read_text()) == []
+
+
+# ── Scale ──────────────────────────────────────────────────────────────────────
+
+SCALE_PERSONS = 2000
+SCALE_EVENTS = 5000
+SCALE_VOTERS_PER_EVENT = 10
+
+
+def scale_inputs(n_events):
+    """Factory-generated inputs with n_events vote events, far larger than the fixtures above."""
+    persons = [{"id": f"p{i}", "memberships": {}} for i in range(SCALE_PERSONS)]
+    vote_events = [
+        {"id": f"ve{j}", "status": "invalid" if j % 10 == 0 else "valid",
+         "start_date": f"2025-{j % 12 + 1:02d}-01"}
+        for j in range(n_events)
+    ]
+    objections = [
+        {"id": f"obj{j}", "vote_event_id": f"ve{j}", "type": "vote_correction",
+         "raised_by_id": f"p{j % SCALE_PERSONS}", "raised_by_type": "person",
+         "outcome": "invalidated", "date": "2025-01-01"}
+        for j in range(0, n_events, 10)
+    ]
+    # Voters of event j: persons (j + k) mod SCALE_PERSONS
+    votes = [
+        (f"ve{j}", f"p{(j + k) % SCALE_PERSONS}")
+        for j in range(n_events)
+        for k in range(SCALE_VOTERS_PER_EVENT)
+    ]
+    return objections, vote_events, votes, persons
+
+
+def best_time(n_events, repeat=3):
+    """Best-of-repeat wall time of calculate_vote_corrections, plus the last result."""
+    objections, vote_events, votes, persons = scale_inputs(n_events)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = calculate_vote_corrections(objections, vote_events, iter(votes), persons, None, None)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+class TestScale:
+    def test_counts(self):
+        _, result = best_time(SCALE_EVENTS, repeat=1)
+        assert len(result) == SCALE_PERSONS
+        # Every event has SCALE_VOTERS_PER_EVENT voters and one in ten is invalid
+        valid_votes = SCALE_EVENTS * SCALE_VOTERS_PER_EVENT * 9 // 10
+        assert sum(r["vote_events_total"] for r in result) == valid_votes
+        assert sum(r["corrections_invalidated"] for r in result) == SCALE_EVENTS // 10
+
+    def test_runtime_is_not_quadratic(self):
+        # Quadrupling the input would take ~16x as long if anything were quadratic in it;
+        # linear work stays near 4x, so 8x leaves room for noise while catching the regression.
+        small, _ = best_time(SCALE_EVENTS)
+        large, _ = best_time(4 * SCALE_EVENTS)
+        assert large / small < 8
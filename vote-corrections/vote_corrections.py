@@ -14,6 +14,11 @@ Optional filters:
   --since        ISO date (YYYY-MM-DD) — ignore vote events before this date
   --until        ISO date (YYYY-MM-DD) — ignore vote events after this date
 
+Other options:
+  --validate-sample N  validate every N-th votes row against the schema (default 1000)
+  --strict-validate    validate every votes row
+  --trust-inputs       skip schema validation of the inputs (already validated upstream)
+
 Output (one row per person):
   person_id, name, given_names, family_names, organizations,
   corrections_total        — times the MP raised a vote_correction
@@ -25,12 +30,15 @@ Output (one row per person):
 
 import argparse
 import csv
-import json
+import functools
+import itertools
 import sys
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from pathlib import Path
 
 import jsonschema
+import orjson
 
 
 # ── Schema paths ───────────────────────────────────────────────────────────────
@@ -45,10 +53,20 @@ SCHEMA_PATHS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def load_schema(key: str) -> dict:
     path = SCHEMA_PATHS[key]
-    with open(path) as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def get_validator(key: str) -> jsonschema.protocols.Validator:
+    """Validator for SCHEMA_PATHS[key]; the schema itself is checked once, here."""
+    schema = load_schema(key)
+    validator_cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
 
 
 # ── Loaders ────────────────────────────────────────────────────────────────────
@@ -57,8 +75,8 @@ def load_json_or_csv(path: str) -> list | dict:
     p = Path(path)
     suffix = p.suffix.lower()
     if suffix == ".json":
-        with open(p) as f:
-            return json.load(f)
+        with open(p, "rb") as f:
+            return orjson.loads(f.read())
     elif suffix == ".csv":
         with open(p, newline="") as f:
             return list(csv.DictReader(f))
@@ -66,65 +84,117 @@ def load_json_or_csv(path: str) -> list | dict:
         raise ValueError(f"Unsupported file extension '{suffix}' for {path}. Expected .json or .csv")
 
 
-def load_objections(path: str) -> list[dict]:
+def load_objections(path: str, validate: bool = True) -> list[dict]:
     data = load_json_or_csv(path)
     if not isinstance(data, list):
         sys.exit(f"objections file '{path}' must contain a JSON array")
-    schema = load_schema("objections")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"objections file '{path}' failed schema validation: {e.message}")
+    if not validate:
+        return data
+    error = jsonschema.exceptions.best_match(get_validator("objections").iter_errors(data))
+    if error is not None:
+        sys.exit(f"objections file '{path}' failed schema validation: {error.message}")
     return data
 
 
-def load_vote_events(path: str) -> list[dict]:
+def load_vote_events(path: str, validate: bool = True) -> list[dict]:
     data = load_json_or_csv(path)
     if not isinstance(data, list):
         sys.exit(f"vote_events file '{path}' must contain a JSON array")
-    schema = load_schema("vote_events")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"vote_events file '{path}' failed schema validation: {e.message}")
+    if not validate:
+        return data
+    error = jsonschema.exceptions.best_match(get_validator("vote_events").iter_errors(data))
+    if error is not None:
+        sys.exit(f"vote_events file '{path}' failed schema validation: {error.message}")
     return data
 
 
-def load_votes(path: str) -> list[dict]:
-    data = load_json_or_csv(path)
-    if not isinstance(data, list):
-        sys.exit(f"votes file '{path}' must be a list/array of rows")
-    row_schema = load_schema("votes_row")
-    for i, row in enumerate(data):
-        try:
-            jsonschema.validate(instance=dict(row), schema=row_schema)
-        except jsonschema.ValidationError as e:
-            sys.exit(f"votes file '{path}' row {i} failed schema validation: {e.message}")
-    return data
+DEFAULT_VALIDATE_SAMPLE = 1000
+
+
+VOTE_COLUMNS = ("vote_event_id", "voter_id")
+
+
+def iter_votes(path: str, sample_every: int = DEFAULT_VALIDATE_SAMPLE) -> Iterator[tuple[str, str]]:
+    """Yield votes as (vote_event_id, voter_id) tuples.
+
+    CSV is streamed with csv.reader and projected to the two columns the
+    calculation uses, so the votes table is never held in memory as a whole.
+    The ids repeat across many rows, so they are interned: duplicates share
+    one string object and set and dict lookups hit the identity fast path.
+    The first row and every sample_every-th row after it are validated against
+    the votes-table schema; sample_every=1 validates every row and
+    sample_every=0 skips validation.
+    """
+    intern = sys.intern
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix not in (".csv", ".json"):
+        raise ValueError(f"Unsupported file extension '{suffix}' for {path}. Expected .json or .csv")
+    # The schema is compiled once and sampled rows are checked as-is; stop at
+    # the first error instead of collecting them all
+    validator = get_validator("votes_row") if sample_every else None
+    with open(p, newline="") as f:
+        if suffix == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            missing = [c for c in VOTE_COLUMNS if c not in header]
+            if missing:
+                sys.exit(f"votes file '{path}' is missing column(s): {', '.join(missing)}")
+            vid_i, voter_i = (header.index(c) for c in VOTE_COLUMNS)
+            width = len(header)
+            # Blank lines are skipped, as csv.DictReader does; rows are
+            # numbered without them. A dict is only built for the rows that
+            # are validated.
+            for i, row in enumerate(row for row in reader if row):
+                if len(row) < width:
+                    sys.exit(f"votes file '{path}' row {i} has {len(row)} field(s), expected {width}")
+                if sample_every and i % sample_every == 0:
+                    error = next(validator.iter_errors(dict(zip(header, row))), None)
+                    if error is not None:
+                        sys.exit(f"votes file '{path}' row {i} failed schema validation: {error.message}")
+                yield intern(row[vid_i]), intern(row[voter_i])
+        else:
+            rows = orjson.loads(f.read())
+            if not isinstance(rows, list):
+                sys.exit(f"votes file '{path}' must be a list/array of rows")
+            for i, row in enumerate(rows):
+                if sample_every and i % sample_every == 0:
+                    error = next(validator.iter_errors(row), None)
+                    if error is not None:
+                        sys.exit(f"votes file '{path}' row {i} failed schema validation: {error.message}")
+                # Unsampled rows are not validated, but the columns read below must be strings
+                if not isinstance(row, dict) or not all(isinstance(row.get(c), str) for c in VOTE_COLUMNS):
+                    sys.exit(f"votes file '{path}' row {i} must have string {', '.join(VOTE_COLUMNS)} fields")
+                yield intern(row["vote_event_id"]), intern(row["voter_id"])
 
 
 def _parse_memberships_csv(raw: str) -> dict:
     if not raw or raw.strip() in ("", "{}"):
         return {}
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return {}
 
 
-def load_persons(path: str) -> list[dict]:
+def load_persons(path: str, validate: bool = True) -> list[dict]:
+    """Load persons from JSON or CSV (all-members.dt.analyses format).
+
+    validate=False skips the schema check for inputs already vetted upstream.
+    """
     p = Path(path)
     if p.suffix.lower() == ".csv":
         with open(p, newline="") as f:
-            reader = csv.DictReader(f)
             rows = []
-            for row in reader:
-                person = dict(row)
+            # DictReader rows are fresh dicts, so they are updated in place
+            for person in csv.DictReader(f):
                 for field in ("identifiers", "sources", "other_names"):
                     if field in person and person[field]:
                         try:
-                            person[field] = json.loads(person[field])
-                        except (json.JSONDecodeError, TypeError):
+                            person[field] = orjson.loads(person[field])
+                        except (orjson.JSONDecodeError, TypeError):
                             person[field] = []
                 if "memberships" in person:
                     person["memberships"] = _parse_memberships_csv(person["memberships"])
@@ -134,25 +204,33 @@ def load_persons(path: str) -> list[dict]:
                 rows.append(person)
         data = rows
     else:
-        with open(p) as f:
-            data = json.load(f)
+        with open(p, "rb") as f:
+            data = orjson.loads(f.read())
 
     if not isinstance(data, list):
         sys.exit(f"persons file '{path}' must contain an array of persons")
 
-    schema = load_schema("persons")
-    try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        sys.exit(f"persons file '{path}' failed schema validation: {e.message}")
+    if not validate:
+        return data
+    error = jsonschema.exceptions.best_match(get_validator("persons").iter_errors(data))
+    if error is not None:
+        sys.exit(f"persons file '{path}' failed schema validation: {error.message}")
     return data
 
 
 # ── Date helpers ───────────────────────────────────────────────────────────────
 
+# Cached: event and objection dates repeat across many rows
+@functools.lru_cache(maxsize=None)
 def parse_date_prefix(s: str | None) -> date | None:
     if not s:
         return None
+    if len(s) == 10:
+        # Plain YYYY-MM-DD, the usual case: parse as a date directly
+        try:
+            return date.fromisoformat(s)
+        except ValueError:
+            return None
     try:
         return datetime.fromisoformat(s).date()
     except ValueError:
@@ -174,67 +252,82 @@ def in_date_range(event_date: date | None, since: date | None, until: date | Non
 
 # ── Core calculation ───────────────────────────────────────────────────────────
 
-def calculate_vote_corrections(
+def iter_vote_corrections(
     objections: list[dict],
     vote_events: list[dict],
-    votes: list[dict],
+    votes: Iterable[tuple[str, str]],
     persons: list[dict],
     since_date: date | None,
     until_date: date | None,
-) -> list[dict]:
+) -> Iterator[dict]:
+    """Yield one output row per person, in persons order.
+
+    The counts are aggregated when the first row is requested; rows are then
+    built one at a time, so they can be written out without holding them all.
+    """
 
-    # Valid vote event IDs within the date range
-    valid_event_ids: set[str] = set()
+    # Dates only need parsing when there is a range to check them against
+    filter_dates = since_date is not None or until_date is not None
+
+    # Valid vote event IDs within the date range, numbered densely in one pass
+    # (a repeated id keeps its first index)
+    event_index: dict[str, int] = {}
     for event in vote_events:
         status = event.get("status", "valid")
         if status in ("invalid", "test"):
             continue
-        event_date = parse_date_prefix(event.get("start_date"))
-        if in_date_range(event_date, since_date, until_date):
-            valid_event_ids.add(event["id"])
-
-    # vote_events_total per person: distinct valid event IDs the person voted in
-    person_events: dict[str, set[str]] = {}
-    for row in votes:
-        vid = row["vote_event_id"]
-        if vid not in valid_event_ids:
+        if not filter_dates or in_date_range(parse_date_prefix(event.get("start_date")), since_date, until_date):
+            event_index.setdefault(sys.intern(event["id"]), len(event_index))
+
+    # vote_events_total per person: distinct valid event IDs the person voted in.
+    # This is the only pass over votes, so they can be streamed. Events are
+    # tracked per person as a bitmap over event_index (bit i = event i) rather
+    # than a set of id strings; one probe both filters the row and gives its
+    # bit position.
+    bitmap_size = (len(event_index) + 7) // 8
+    person_events: dict[str, bytearray] = {}
+    for vid, pid in votes:
+        i = event_index.get(vid)
+        if i is None:
             continue
-        pid = row["voter_id"]
-        person_events.setdefault(pid, set()).add(vid)
+        events = person_events.get(pid)
+        if events is None:
+            events = person_events[pid] = bytearray(bitmap_size)
+        events[i >> 3] |= 1 << (i & 7)
 
     # Filter objections: only vote_correction type, by date range
-    # Group by raised_by_id
-    corrections: dict[str, dict] = {}  # pid -> {total, invalidated, announced}
+    # Group by raised_by_id; counters are mutated in place, one lookup per objection
+    corrections: dict[str, list[int]] = {}  # pid -> [total, invalidated, announced]
     for obj in objections:
         if obj.get("type") != "vote_correction":
             continue
         pid = obj.get("raised_by_id")
         if not pid:
             continue
-        obj_date = parse_date_prefix(obj.get("date"))
-        if not in_date_range(obj_date, since_date, until_date):
+        if filter_dates and not in_date_range(parse_date_prefix(obj.get("date")), since_date, until_date):
             continue
-        if pid not in corrections:
-            corrections[pid] = {"total": 0, "invalidated": 0, "announced": 0}
-        corrections[pid]["total"] += 1
+        c = corrections.get(pid)
+        if c is None:
+            c = corrections[pid] = [0, 0, 0]
+        c[0] += 1
         outcome = obj.get("outcome")
         if outcome == "invalidated":
-            corrections[pid]["invalidated"] += 1
+            c[1] += 1
         elif outcome == "announced":
-            corrections[pid]["announced"] += 1
+            c[2] += 1
 
     # Build output rows — one per person from the persons list
-    output: list[dict] = []
     for person in persons:
         person_id = person["id"]
-        c = corrections.get(person_id, {"total": 0, "invalidated": 0, "announced": 0})
-        vote_events_total = len(person_events.get(person_id, set()))
+        total, invalidated, announced = corrections.get(person_id, (0, 0, 0))
+        events = person_events.get(person_id)
+        vote_events_total = int.from_bytes(events, "little").bit_count() if events else 0
 
         row: dict = {
             "person_id": person_id,
-            "corrections_total":       c["total"],
-            "corrections_invalidated": c["invalidated"],
-            "corrections_announced":   c["announced"],
+            "corrections_total":       total,
+            "corrections_invalidated": invalidated,
+            "corrections_announced":   announced,
             "vote_events_total":       vote_events_total,
         }
 
@@ -287,9 +380,43 @@ def calculate_vote_corrections(
         if extras:
             row["extras"] = extras
 
-        output.append(row)
+        yield row
+
 
-    return output
+def calculate_vote_corrections(
+    objections: list[dict],
+    vote_events: list[dict],
+    votes: Iterable[tuple[str, str]],
+    persons: list[dict],
+    since_date: date | None,
+    until_date: date | None,
+) -> list[dict]:
+    """All output rows as a list (see iter_vote_corrections)."""
+    return list(iter_vote_corrections(objections, vote_events, votes, persons, since_date, until_date))
+
+
+# ── Output ─────────────────────────────────────────────────────────────────────
+
+def write_output(rows: Iterable[dict], path: Path) -> int:
+    """Write rows as an indented JSON array one row at a time; return the row count.
+
+    Produces the same bytes as orjson.dumps(list(rows), option=OPT_INDENT_2).
+    The file is only opened once the first row is ready, so a run that fails
+    while computing leaves any previous output in place.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    with open(path, "wb") as f:
+        if first is None:
+            f.write(b"[]")
+            return 0
+        n = 0
+        for row in itertools.chain((first,), rows):
+            f.write(b"[\n  " if n == 0 else b",\n  ")
+            f.write(orjson.dumps(row, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+            n += 1
+        f.write(b"\n]")
+    return n
 
 
 # ── Entry point ────────────────────────────────────────────────────────────────
@@ -305,34 +432,49 @@ def main() -> None:
     parser.add_argument("--output",      required=True, help="Path to write output JSON")
     parser.add_argument("--since",       default=None,  help="Start date filter (YYYY-MM-DD)")
     parser.add_argument("--until",       default=None,  help="End date filter (YYYY-MM-DD)")
+    parser.add_argument("--validate-sample", type=int, default=DEFAULT_VALIDATE_SAMPLE, metavar="N",
+                        help=f"Validate every N-th votes row (default {DEFAULT_VALIDATE_SAMPLE})")
+    parser.add_argument("--strict-validate", action="store_true",
+                        help="Validate every votes row (overrides --validate-sample)")
+    parser.add_argument("--trust-inputs", action="store_true",
+                        help="Skip schema validation of objections, vote_events, votes and persons")
     args = parser.parse_args()
+    if args.validate_sample < 1:
+        parser.error("--validate-sample must be at least 1")
+    if args.strict_validate and args.trust_inputs:
+        parser.error("--strict-validate and --trust-inputs are mutually exclusive")
+    if args.trust_inputs:
+        sample_every = 0
+    elif args.strict_validate:
+        sample_every = 1
+    else:
+        sample_every = args.validate_sample
+    validate_inputs = not args.trust_inputs
 
     since_date = parse_date_prefix(args.since)
     until_date = parse_date_prefix(args.until)
 
-    print("Loading and validating objections...", file=sys.stderr)
-    objections = load_objections(args.objections)
-
-    print("Loading and validating vote_events...", file=sys.stderr)
-    vote_events = load_vote_events(args.vote_events)
+    # Schemas are only loaded when something is validated against them
+    print("Loading objections..." if args.trust_inputs else "Loading and validating objections...", file=sys.stderr)
+    objections = load_objections(args.objections, validate=validate_inputs)
 
-    print("Loading and validating votes...", file=sys.stderr)
-    votes = load_votes(args.votes)
+    print("Loading vote_events..." if args.trust_inputs else "Loading and validating vote_events...", file=sys.stderr)
+    vote_events = load_vote_events(args.vote_events, validate=validate_inputs)
 
-    print("Loading and validating persons...", file=sys.stderr)
-    persons = load_persons(args.persons)
+    print("Loading persons..." if args.trust_inputs else "Loading and validating persons...", file=sys.stderr)
+    persons = load_persons(args.persons, validate=validate_inputs)
 
-    print("Calculating vote corrections...", file=sys.stderr)
-    output = calculate_vote_corrections(
-        objections, vote_events, votes, persons, since_date, until_date
+    # Votes are read once, so they are streamed through the calculation
+    print("Streaming votes and calculating vote corrections...", file=sys.stderr)
+    rows = iter_vote_corrections(
+        objections, vote_events, iter_votes(args.votes, sample_every), persons, since_date, until_date
     )
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    n = write_output(rows, out_path)
 
-    print(f"Done. Wrote {len(output)} records to {args.output}", file=sys.stderr)
+    print(f"Done. Wrote {n} records to {args.output}", file=sys.stderr)
 
 
 if __name__ == "__main__":